@@ -2,15 +2,26 @@ from flask import Flask
 from .config import Config
 from .models import db
 from .routes import bp
+from .commands import register_commands
 
 def create_app():
     app = Flask(__name__,  template_folder='../templates')
     app.config.from_object(Config)
     
+    # Part PUTs are single request bodies, so they must fit under Flask's limit
+    if app.config['UPLOAD_PART_SIZE'] > app.config['MAX_CONTENT_LENGTH']:
+        raise ValueError(
+            f"UPLOAD_PART_SIZE ({app.config['UPLOAD_PART_SIZE']}) exceeds MAX_CONTENT_LENGTH "
+            f"({app.config['MAX_CONTENT_LENGTH']}); every chunked part upload would get a 413"
+        )
+    
     # Initialize extensions
     db.init_app(app)
     
     # Register blueprints
     app.register_blueprint(bp)
     
+    # Register CLI commands
+    register_commands(app)
+    
     return app
\ No newline at end of file
@@ -0,0 +1,242 @@
+import click
+from flask.cli import with_appcontext
+from .models import db, Candidate, Education, Skill, UploadSession, CandidateSignature
+from .utils.skills import seed_skill_dictionary, normalize_skills
+from .utils.shortlister import build_candidate_text, get_candidate_text, encode_texts
+from .utils.vector_store import init_vector_store, store_candidate_embedding, use_pgvector
+from .utils.file_processor import abort_multipart_upload, download_from_s3, get_s3_client
+from .utils.duplicates import store_signature, find_near_duplicates, merge_candidate
+from .utils.minhash import minhash_signature
+from .utils.parser import extract_text
+from .utils.response_cache import bump_versions
+from .config import Config
+from datetime import timedelta
+from sqlalchemy import text
+import os
+import tempfile
+
+@click.command('seed-skills')
+@with_appcontext
+def seed_skills_command():
+    """Insert the default canonical skills and aliases."""
+    count = seed_skill_dictionary()
+    click.echo(f'Skill dictionary loaded with {count} names and aliases')
+
+@click.command('rebuild-profiles')
+@click.option('--all', 'rebuild_all', is_flag=True, help='Rebuild every profile, not only missing ones.')
+@click.option('--batch-size', default=500, show_default=True)
+@with_appcontext
+def rebuild_profiles_command(rebuild_all, batch_size):
+    """Normalize stored skills and materialize candidate profile text."""
+    query = Candidate.query
+    if not rebuild_all:
+        query = query.filter(Candidate.profile_text.is_(None))
+
+    candidate_ids = [row.candidate_id for row in query.with_entities(Candidate.candidate_id)]
+    for start in range(0, len(candidate_ids), batch_size):
+        batch_ids = candidate_ids[start:start + batch_size]
+        for candidate in Candidate.query.filter(Candidate.candidate_id.in_(batch_ids)).all():
+            skills = Skill.query.filter_by(candidate_id=candidate.candidate_id).all()
+            educations = Education.query.filter_by(candidate_id=candidate.candidate_id).all()
+
+            normalized = normalize_skills([
+                {'name': skill.skill_name, 'category': skill.skill_category,
+                 'proficiency': skill.proficiency_level}
+                for skill in skills
+            ])
+
+            # Replace raw skill rows with one row per dictionary entry
+            for skill in skills:
+                db.session.delete(skill)
+            for skill_data in normalized:
+                db.session.add(Skill(
+                    candidate_id=candidate.candidate_id,
+                    skill_name=skill_data['name'],
+                    dictionary_id=skill_data['dictionary_id'],
+                    skill_category=skill_data['category'],
+                    proficiency_level=skill_data['proficiency']
+                ))
+
+            candidate.profile_text = build_candidate_text({
+                'full_name': candidate.full_name,
+                'skills': normalized,
+                'years_experience': candidate.years_experience,
+                'education': [{'degree': edu.degree} for edu in educations if edu.degree]
+            })
+        # Candidate pages list the rewritten skills
+        bump_versions('candidates')
+        db.session.commit()
+
+    click.echo(f'Rebuilt {len(candidate_ids)} candidate profiles')
+
+@click.command('init-vector-store')
+@with_appcontext
+def init_vector_store_command():
+    """Create the pgvector extension, embeddings table and index."""
+    init_vector_store()
+    click.echo('pgvector store ready')
+
+@click.command('index-embeddings')
+@click.option('--all', 'reindex_all', is_flag=True, help='Re-embed every candidate, not only missing ones.')
+@click.option('--batch-size', default=256, show_default=True)
+@with_appcontext
+def index_embeddings_command(reindex_all, batch_size):
+    """Store candidate embeddings in the pgvector table."""
+    query = Candidate.query
+    if not reindex_all:
+        query = query.filter(~Candidate.candidate_id.in_(
+            db.select(text('candidate_id')).select_from(text('candidate_embeddings'))
+        ))
+
+    candidate_ids = [row.candidate_id for row in query.with_entities(Candidate.candidate_id)]
+    for start in range(0, len(candidate_ids), batch_size):
+        batch_ids = candidate_ids[start:start + batch_size]
+        candidates = Candidate.query.filter(Candidate.candidate_id.in_(batch_ids)).all()
+        texts = []
+        for candidate in candidates:
+            candidate_data = {'profile_text': candidate.profile_text}
+            if not candidate.profile_text:
+                candidate_data.update({
+                    'full_name': candidate.full_name,
+                    'years_experience': candidate.years_experience,
+                    'skills': [{'name': skill.skill_name} for skill in candidate.skills],
+                    'education': [{'degree': edu.degree} for edu in candidate.educations]
+                })
+            texts.append(get_candidate_text(candidate_data))
+
+        for candidate, embedding in zip(candidates, encode_texts(texts)):
+            store_candidate_embedding(candidate.candidate_id, embedding)
+        db.session.commit()
+
+    click.echo(f'Indexed {len(candidate_ids)} candidate embeddings')
+
+@click.command('abort-stale-uploads')
+@click.option('--hours', type=int, default=None, help='Age in hours (defaults to UPLOAD_SESSION_TTL_HOURS).')
+@with_appcontext
+def abort_stale_uploads_command(hours):
+    """Abort chunked uploads that were never completed and free their S3 parts."""
+    cutoff = db.func.current_timestamp() - timedelta(hours=hours or Config.UPLOAD_SESSION_TTL_HOURS)
+    stale = UploadSession.query.filter(UploadSession.created_at < cutoff).all()
+    aborted = 0
+    for upload_session in stale:
+        if abort_multipart_upload(upload_session.file_key, upload_session.s3_upload_id):
+            if upload_session.status == 'completing':
+                # S3 may have assembled the file before the completing request died
+                s3_client = get_s3_client()
+                if s3_client:
+                    s3_client.delete_object(Bucket=Config.S3_BUCKET_NAME, Key=upload_session.file_key)
+            db.session.delete(upload_session)
+            aborted += 1
+    db.session.commit()
+    click.echo(f'Aborted {aborted} of {len(stale)} stale uploads')
+
+@click.command('index-signatures')
+@click.option('--batch-size', default=100, show_default=True)
+@with_appcontext
+def index_signatures_command(batch_size):
+    """Compute MinHash signatures for candidates uploaded before near-duplicate detection."""
+    candidate_ids = [row.candidate_id for row in Candidate.query
+                     .filter(~Candidate.candidate_id.in_(db.select(CandidateSignature.candidate_id)))
+                     .with_entities(Candidate.candidate_id)
+                     .order_by(Candidate.candidate_id)]
+    indexed = flagged = 0
+    for start in range(0, len(candidate_ids), batch_size):
+        for candidate in Candidate.query.filter(Candidate.candidate_id.in_(candidate_ids[start:start + batch_size])):
+            if not candidate.resume_file_path:
+                continue
+            file_extension = os.path.splitext(candidate.resume_file_path)[1][1:].lower()
+            with tempfile.NamedTemporaryFile(suffix=f'.{file_extension}') as temp_file:
+                try:
+                    download_from_s3(candidate.resume_file_path, temp_file.name)
+                except Exception as e:
+                    click.echo(f'Skipping candidate {candidate.candidate_id}: {e}', err=True)
+                    continue
+                signature = minhash_signature(extract_text(temp_file.name, file_extension))
+            if signature is None:
+                continue
+
+            # Only earlier candidates count as originals, as they would have at upload
+            matches = [(candidate_id, score) for candidate_id, score
+                       in find_near_duplicates(signature, exclude_id=candidate.candidate_id)
+                       if candidate_id < candidate.candidate_id]
+            if matches and candidate.duplicate_of_id is None:
+                candidate.duplicate_of_id, candidate.duplicate_score = matches[0]
+                flagged += 1
+            store_signature(candidate.candidate_id, signature)
+            indexed += 1
+        # Newly flagged duplicates show up on the dashboard
+        bump_versions('candidates')
+        db.session.commit()
+
+    click.echo(f'Indexed {indexed} signatures, flagged {flagged} likely duplicates')
+
+@click.command('merge-duplicates')
+@click.option('--min-score', type=float, default=None,
+              help='Only merge pairs at least this similar (defaults to NEAR_DUPLICATE_THRESHOLD).')
+@click.option('--dry-run', is_flag=True, help='List the merges without changing anything.')
+@with_appcontext
+def merge_duplicates_command(min_score, dry_run):
+    """Merge candidates flagged as near-duplicates into the earlier record."""
+    min_score = Config.NEAR_DUPLICATE_THRESHOLD if min_score is None else min_score
+    duplicate_ids = [row.candidate_id for row in Candidate.query
+                     .filter(Candidate.duplicate_of_id.isnot(None), Candidate.duplicate_score >= min_score)
+                     .with_entities(Candidate.candidate_id)
+                     .order_by(Candidate.candidate_id)]
+
+    merged_resumes = []
+    merged_into = set()
+    for duplicate_id in duplicate_ids:
+        # Earlier merges may have removed or re-pointed this record
+        duplicate = db.session.get(Candidate, duplicate_id)
+        if duplicate is None or duplicate.duplicate_of_id is None:
+            continue
+        canonical = db.session.get(Candidate, duplicate.duplicate_of_id)
+        if canonical is None:
+            continue
+
+        click.echo(f'{"Would merge" if dry_run else "Merging"} #{duplicate.candidate_id} '
+                   f'({duplicate.email}) into #{canonical.candidate_id} ({canonical.email}), '
+                   f'similarity {duplicate.duplicate_score:.2f}')
+        if dry_run:
+            continue
+
+        merged_resumes.append(merge_candidate(duplicate, canonical))
+        merged_into.add(canonical.candidate_id)
+        db.session.flush()
+
+    if dry_run:
+        return
+
+    # Refresh ranking profiles (and embeddings) of the surviving records
+    survivors = Candidate.query.filter(Candidate.candidate_id.in_(merged_into)).all() if merged_into else []
+    for candidate in survivors:
+        candidate.profile_text = build_candidate_text({
+            'full_name': candidate.full_name,
+            'skills': [{'name': skill.skill_name} for skill in candidate.skills],
+            'years_experience': candidate.years_experience,
+            'education': [{'degree': edu.degree} for edu in candidate.educations if edu.degree]
+        })
+    if survivors and use_pgvector():
+        for candidate, embedding in zip(survivors, encode_texts([c.profile_text for c in survivors])):
+            store_candidate_embedding(candidate.candidate_id, embedding)
+    bump_versions('candidates', 'shortlists')
+    db.session.commit()
+
+    s3_client = get_s3_client()
+    for resume_file_path in merged_resumes:
+        if s3_client and resume_file_path:
+            try:
+                s3_client.delete_object(Bucket=Config.S3_BUCKET_NAME, Key=resume_file_path)
+            except Exception as e:
+                click.echo(f'Failed to delete {resume_file_path} from S3: {e}', err=True)
+
+    click.echo(f'Merged {len(merged_resumes)} duplicate candidates into {len(merged_into)} records')
+
+def register_commands(app):
+    app.cli.add_command(seed_skills_command)
+    app.cli.add_command(rebuild_profiles_command)
+    app.cli.add_command(init_vector_store_command)
+    app.cli.add_command(index_embeddings_command)
+    app.cli.add_command(abort_stale_uploads_command)
+    app.cli.add_command(index_signatures_command)
+    app.cli.add_command(merge_duplicates_command)
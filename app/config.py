@@ -20,3 +20,69 @@ class Config:
         f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', '10')),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '20')),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', '30')),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', '1800')),
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true',
+    }
+
+    # Shortlisting
+    SHORTLIST_BATCH_MAX_JOBS = int(os.getenv('SHORTLIST_BATCH_MAX_JOBS', '50'))
+    SHORTLIST_CHUNK_SIZE = int(os.getenv('SHORTLIST_CHUNK_SIZE', '4096'))
+    SHORTLIST_STREAM_CHUNK_SIZE = int(os.getenv('SHORTLIST_STREAM_CHUNK_SIZE', '256'))
+    SHORTLIST_STREAM_PREVIEW_SIZE = int(os.getenv('SHORTLIST_STREAM_PREVIEW_SIZE', '10'))
+
+    # Vector search backend: 'numpy' (in-process feature store) or 'pgvector' (ranked in Postgres)
+    SHORTLIST_BACKEND = os.getenv('SHORTLIST_BACKEND', 'numpy')
+    # How often the in-process feature store checks the candidates table for changes
+    FEATURE_STORE_REFRESH_SECONDS = float(os.getenv('FEATURE_STORE_REFRESH_SECONDS', '2'))
+    EMBEDDING_DIMENSION = int(os.getenv('EMBEDDING_DIMENSION', '384'))
+    PGVECTOR_INDEX = os.getenv('PGVECTOR_INDEX', 'hnsw')
+    PGVECTOR_HNSW_EF_SEARCH = int(os.getenv('PGVECTOR_HNSW_EF_SEARCH', '100'))
+    PGVECTOR_IVFFLAT_LISTS = int(os.getenv('PGVECTOR_IVFFLAT_LISTS', '100'))
+    PGVECTOR_IVFFLAT_PROBES = int(os.getenv('PGVECTOR_IVFFLAT_PROBES', '10'))
+
+    # Opt-in process pool for resume parsing; 0 (the default) parses in the request
+    # thread. Each pool process imports the app and loads its own spaCy model.
+    CPU_WORKERS = int(os.getenv('CPU_WORKERS', '0'))
+    CPU_WORKER_MAX_PENDING = int(os.getenv('CPU_WORKER_MAX_PENDING', '16'))
+    CPU_WORKER_QUEUE_TIMEOUT = float(os.getenv('CPU_WORKER_QUEUE_TIMEOUT', '30'))
+    S3_MAX_POOL_CONNECTIONS = int(os.getenv('S3_MAX_POOL_CONNECTIONS', '50'))
+
+    # Upload limits. MAX_CONTENT_LENGTH caps any single request body (Flask answers 413);
+    # larger resumes go through the chunked /uploads protocol in UPLOAD_PART_SIZE parts.
+    MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', str(10 * 1024 * 1024)))
+    UPLOAD_MAX_FILE_SIZE = int(os.getenv('UPLOAD_MAX_FILE_SIZE', str(100 * 1024 * 1024)))
+    # S3 requires every part except the last to be at least 5 MiB
+    UPLOAD_PART_SIZE = max(5 * 1024 * 1024, int(os.getenv('UPLOAD_PART_SIZE', str(5 * 1024 * 1024))))
+    # Part bodies larger than this are spooled to disk instead of memory
+    UPLOAD_SPOOL_MAX_MEMORY = int(os.getenv('UPLOAD_SPOOL_MAX_MEMORY', str(1024 * 1024)))
+    UPLOAD_SESSION_TTL_HOURS = int(os.getenv('UPLOAD_SESSION_TTL_HOURS', '24'))
+
+    # Duplicate check before parsing: regex over the first pages, then a Bloom filter of known emails
+    DUPLICATE_CHECK_MAX_PAGES = int(os.getenv('DUPLICATE_CHECK_MAX_PAGES', '2'))
+    KNOWN_EMAILS_CAPACITY = int(os.getenv('KNOWN_EMAILS_CAPACITY', '1000000'))
+    KNOWN_EMAILS_ERROR_RATE = float(os.getenv('KNOWN_EMAILS_ERROR_RATE', '0.01'))
+    KNOWN_EMAILS_REFRESH_SECONDS = float(os.getenv('KNOWN_EMAILS_REFRESH_SECONDS', '30'))
+
+    # Near-duplicate detection: 128-slot MinHash split into LSH bands (rows per band = 128 / bands)
+    MINHASH_BANDS = int(os.getenv('MINHASH_BANDS', '16'))
+    NEAR_DUPLICATE_THRESHOLD = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.8'))
+    NEAR_DUPLICATE_MAX_MATCHES = int(os.getenv('NEAR_DUPLICATE_MAX_MATCHES', '100'))
+
+    # Rendered dashboard/job description pages, keyed by per-table change counters.
+    # Other processes' writes are seen within RESPONSE_CACHE_REFRESH_SECONDS.
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+    RESPONSE_CACHE_REFRESH_SECONDS = float(os.getenv('RESPONSE_CACHE_REFRESH_SECONDS', '2'))
+
+    # Sentence encoder service (0 workers encodes on a single in-process thread)
+    ENCODER_MODEL_NAME = os.getenv('ENCODER_MODEL_NAME', 'all-MiniLM-L6-v2')
+    ENCODER_WORKERS = int(os.getenv('ENCODER_WORKERS', '0'))
+    ENCODER_THREADS_PER_WORKER = int(os.getenv('ENCODER_THREADS_PER_WORKER', '1'))
+    ENCODER_MAX_BATCH_SIZE = int(os.getenv('ENCODER_MAX_BATCH_SIZE', '64'))
+    ENCODER_MAX_WAIT_MS = float(os.getenv('ENCODER_MAX_WAIT_MS', '10'))
+    # 'torch', 'torch-int8', 'onnx' or 'onnx-int8' (ONNX needs onnx + onnxruntime)
+    ENCODER_BACKEND = os.getenv('ENCODER_BACKEND', 'torch')
+    ENCODER_ONNX_DIR = os.getenv('ENCODER_ONNX_DIR', os.path.expanduser('~/.cache/resume-shortlisting/onnx'))
@@ -1,4 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 
 db = SQLAlchemy()
 
@@ -7,15 +8,24 @@ class Candidate(db.Model):
     
     candidate_id = db.Column(db.Integer, primary_key=True)
     full_name = db.Column(db.String(100), nullable=False)
-    email = db.Column(db.String(100), unique=True, nullable=False, index=True)
+    # Unique case-insensitively through candidates_email_lower_key
+    email = db.Column(db.String(100), nullable=False)
     phone = db.Column(db.String(20))
     location = db.Column(db.String(100))
     years_experience = db.Column(db.Integer)
     resume_file_path = db.Column(db.String(255))
     status = db.Column(db.String(20), default='pending')
+    profile_text = db.Column(db.Text)
+    # Likely the same person as an earlier candidate (near-duplicate resume text)
+    duplicate_of_id = db.Column(db.Integer, db.ForeignKey('candidates.candidate_id', ondelete='SET NULL'), index=True)
+    duplicate_score = db.Column(db.Float)
     created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp())
     updated_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
     
+    __table_args__ = (
+        db.Index('candidates_email_lower_key', db.func.lower(email), unique=True),
+    )
+    
     educations = db.relationship('Education', backref='candidate', lazy=True, cascade='all, delete-orphan')
     skills = db.relationship('Skill', backref='candidate', lazy=True, cascade='all, delete-orphan')
     
@@ -29,6 +39,19 @@ class Candidate(db.Model):
         """Find candidate by email (case-insensitive)"""
         return cls.query.filter(db.func.lower(cls.email) == email.lower().strip()).first()
     
+    @classmethod
+    def insert_if_absent(cls, **values):
+        """Insert a candidate unless the email (case-insensitive) already exists.
+        
+        Uses INSERT ... ON CONFLICT DO NOTHING against the lower(email) index and
+        returns the new candidate_id, or None when the email is taken.
+        """
+        values['email'] = values['email'].lower().strip()
+        stmt = insert(cls).values(**values).on_conflict_do_nothing(
+            index_elements=[db.func.lower(cls.email)]
+        ).returning(cls.candidate_id)
+        return db.session.execute(stmt).scalar()
+    
     def __repr__(self):
         return f'<Candidate {self.full_name} ({self.email})>'
 
@@ -48,9 +71,84 @@ class Skill(db.Model):
     skill_id = db.Column(db.Integer, primary_key=True)
     candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.candidate_id'), nullable=False)
     skill_name = db.Column(db.String(100))
+    dictionary_id = db.Column(db.Integer, db.ForeignKey('skill_dictionary.id'), index=True)
     skill_category = db.Column(db.String(20))
     proficiency_level = db.Column(db.String(20))
 
+class SkillDictionary(db.Model):
+    __tablename__ = 'skill_dictionary'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    canonical_name = db.Column(db.String(100), nullable=False)
+    normalized_name = db.Column(db.String(100), unique=True, nullable=False, index=True)
+    category = db.Column(db.String(20), default='technical')
+    aliases = db.Column(ARRAY(db.String(100)), default=list)
+    
+    __table_args__ = (
+        # Serves the aliases @> ARRAY[...] lookups in resolve_skill
+        db.Index('ix_skill_dictionary_aliases', aliases, postgresql_using='gin'),
+    )
+    
+    def __repr__(self):
+        return f'<SkillDictionary {self.canonical_name}>'
+
+class CandidateSignature(db.Model):
+    """MinHash signature of a candidate's resume text (uint32 bytes)"""
+    __tablename__ = 'candidate_signatures'
+    
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.candidate_id', ondelete='CASCADE'), primary_key=True)
+    signature = db.Column(db.LargeBinary, nullable=False)
+
+class CandidateLshBucket(db.Model):
+    """LSH index: one row per (band, bucket) a candidate's signature hashes to"""
+    __tablename__ = 'candidate_lsh_buckets'
+    
+    band = db.Column(db.SmallInteger, primary_key=True)
+    bucket = db.Column(db.BigInteger, primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('candidates.candidate_id', ondelete='CASCADE'),
+                             primary_key=True, index=True)
+
+class UploadSession(db.Model):
+    """A chunked resume upload in progress, backed by an S3 multipart upload.
+    
+    Uploaded parts are tracked by S3 itself (ListParts), so a client can
+    resume after an interruption by asking which parts are missing.
+    """
+    __tablename__ = 'upload_sessions'
+    
+    id = db.Column(db.String(36), primary_key=True)
+    s3_upload_id = db.Column(db.String(1024), nullable=False)
+    file_key = db.Column(db.String(255), nullable=False)
+    filename = db.Column(db.String(255), nullable=False)
+    file_extension = db.Column(db.String(10), nullable=False)
+    total_size = db.Column(db.BigInteger, nullable=False)
+    part_size = db.Column(db.Integer, nullable=False)
+    # 'uploading', or 'completing' while /complete assembles the parts in S3
+    status = db.Column(db.String(20), nullable=False, default='uploading')
+    created_at = db.Column(db.TIMESTAMP, server_default=db.func.current_timestamp(), index=True)
+    
+    @property
+    def total_parts(self):
+        return max(1, -(-self.total_size // self.part_size))
+    
+    def expected_part_size(self, part_number):
+        """Exact byte length of a part; only the last one may be short"""
+        if part_number < self.total_parts:
+            return self.part_size
+        return self.total_size - self.part_size * (self.total_parts - 1)
+    
+    def __repr__(self):
+        return f'<UploadSession {self.id} ({self.filename})>'
+
+class CacheVersion(db.Model):
+    """Change counter of a table; cached pages are keyed by the versions they were built from"""
+    __tablename__ = 'cache_versions'
+    
+    table_name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    # UTC, served as Last-Modified
+    updated_at = db.Column(db.TIMESTAMP, server_default=db.text("timezone('utc', now())"))
+
 
 class JobDescription(db.Model):
     __tablename__ = 'job_descriptions'
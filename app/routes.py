@@ -1,22 +1,44 @@
-from flask import Blueprint, request, jsonify, render_template
+from flask import Blueprint, request, jsonify, render_template, Response, stream_with_context
 from werkzeug.utils import secure_filename
 import os
-from .models import db, Candidate, Education, Skill, JobDescription, Shortlist
-from .utils.file_processor import upload_to_s3, get_s3_url
-from .utils.parser import parse_resume
-from .utils.shortlister import rank_candidates
+from .models import db, Candidate, Education, Skill, JobDescription, Shortlist, UploadSession
+from .utils.file_processor import (upload_to_s3, get_s3_url, new_file_key, spool_stream,
+                                   create_multipart_upload, upload_part, list_uploaded_parts,
+                                   complete_multipart_upload, abort_multipart_upload, download_from_s3)
+from .utils.parser import parse_resume, extract_email
+from .utils.shortlister import build_candidate_text, encode_texts, get_top_count
+from .utils.vector_store import use_pgvector, store_candidate_embedding, count_indexed_candidates, search_candidates
+from .utils.skills import normalize_skills
+from .utils.duplicates import find_existing_candidate, get_known_emails, find_near_duplicates, store_signature
+from .utils.executor import run_cpu_bound, WorkerPoolBusyError
+from .utils.encoder import get_encoder
+from .utils.feature_store import (rank_from_store, iter_rank_from_store, get_feature_store,
+                                  loaded_feature_store, profile_hash)
+from .utils.response_cache import cached_page, bump_versions
 from datetime import datetime
 import tempfile
+import json
 from .config import Config
 from sqlalchemy.exc import IntegrityError
+from werkzeug.exceptions import RequestEntityTooLarge
+import uuid
 import logging
 
 bp = Blueprint('main', __name__)
 logger = logging.getLogger(__name__)
 
+ALLOWED_EXTENSIONS = ('pdf', 'docx', 'doc', 'txt')
+
+@bp.app_errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    return jsonify({
+        'error': f'Request body exceeds the {Config.MAX_CONTENT_LENGTH} byte limit; '
+                 'use the chunked /uploads API for large files'
+    }), 413
+
 @bp.route('/')
 def index():
-    return render_template('upload.html')
+    return render_template('upload.html', upload_max_mb=Config.UPLOAD_MAX_FILE_SIZE // (1024 * 1024))
 
 @bp.route('/upload', methods=['POST'])
 def upload_resume():
@@ -29,7 +51,7 @@ def upload_resume():
     
     # Save to temp file for processing
     file_extension = os.path.splitext(file.filename)[1][1:].lower()
-    if file_extension not in ['pdf', 'docx', 'doc', 'txt']:
+    if file_extension not in ALLOWED_EXTENSIONS:
         return jsonify({'error': 'Unsupported file type'}), 400
     
     temp_file_path = None
@@ -40,117 +62,29 @@ def upload_resume():
             temp_file_path = temp_file.name
             file.save(temp_file.name)
             
-            # Parse resume first to get email
-            parsed_data = parse_resume(temp_file.name, file_extension)
+            # Reject known emails before NER, embeddings or S3 are touched
+            existing_candidate = check_duplicate_email(temp_file.name, file_extension)
+            if existing_candidate:
+                return duplicate_email_response(existing_candidate.email, existing_candidate)
+            
+            # Parse resume first to get email (CPU-bound, runs in the worker pool)
+            parsed_data = run_cpu_bound(parse_resume, temp_file.name, file_extension)
             if not parsed_data:
                 return jsonify({'error': 'Failed to parse resume'}), 500
             
             if not parsed_data.get('email'):
                 return jsonify({'error': 'No email found in resume'}), 400
             
-            # Normalize email
-            normalized_email = parsed_data['email'].lower().strip()
-            
             file.seek(0)  # Reset file pointer
             file_key = upload_to_s3(file, secure_filename(file.filename))
             if not file_key:
                 return jsonify({'error': 'Failed to upload to cloud storage'}), 500
             
-            # Start a database transaction
-            try:
-                # Check for existing candidate within the same transaction
-                existing_candidate = db.session.query(Candidate).filter(
-                    db.func.lower(Candidate.email) == normalized_email
-                ).with_for_update().first()
-                
-                if existing_candidate:
-                    # Clean up the uploaded file since we won't use it
-                    cleanup_s3_file(file_key)
-                    db.session.rollback()
-                    return jsonify({
-                        'error': f'A candidate with email {parsed_data["email"]} already exists',
-                        'existing_candidate_id': existing_candidate.candidate_id,
-                        'existing_candidate_name': existing_candidate.full_name
-                    }), 409
-                
-                # Create candidate record with normalized email
-                candidate = Candidate(
-                    full_name=parsed_data['full_name'],
-                    email=normalized_email,
-                    phone=parsed_data['phone'],
-                    location=parsed_data['location'],
-                    years_experience=parsed_data['years_experience'],
-                    resume_file_path=file_key,
-                    status='pending'
-                )
-                
-                db.session.add(candidate)
-                db.session.flush()  
-                
-                # Add education records
-                for edu in parsed_data.get('education', []):
-                    education = Education(
-                        candidate_id=candidate.candidate_id,
-                        degree=edu.get('degree', ''),
-                        institution=edu.get('institution', ''),
-                        graduation_year=edu.get('graduation_year'),
-                        gpa=edu.get('gpa')
-                    )
-                    db.session.add(education)
-                
-                # Add skill records
-                for skill_data in parsed_data.get('skills', []):
-                    skill = Skill(
-                        candidate_id=candidate.candidate_id,
-                        skill_name=skill_data.get('name', ''),
-                        skill_category=skill_data.get('category', 'technical'),
-                        proficiency_level=skill_data.get('proficiency', 'intermediate')
-                    )
-                    db.session.add(skill)
-                
-                # Commit all changes
-                db.session.commit()
-                
-                return jsonify({
-                    'message': 'Resume processed successfully',
-                    'candidate_id': candidate.candidate_id,
-                    'full_name': candidate.full_name,
-                    'email': candidate.email,
-                    'years_experience': candidate.years_experience
-                }), 201
-                
-            except IntegrityError as e:
-                db.session.rollback()
-                cleanup_s3_file(file_key)
-                
-                # Check if it's specifically an email unique constraint violation
-                if 'candidates_email_key' in str(e) or ('unique constraint' in str(e).lower() and 'email' in str(e).lower()):
-                    # Find the existing candidate to return proper error info
-                    existing_candidate = db.session.query(Candidate).filter(
-                        db.func.lower(Candidate.email) == normalized_email
-                    ).first()
-                    
-                    if existing_candidate:
-                        return jsonify({
-                            'error': f'A candidate with email {parsed_data["email"]} already exists',
-                            'existing_candidate_id': existing_candidate.candidate_id,
-                            'existing_candidate_name': existing_candidate.full_name
-                        }), 409
-                    else:
-                        return jsonify({
-                            'error': f'A candidate with email {parsed_data["email"]} already exists'
-                        }), 409
-                else:
-                    # Some other integrity error
-                    logger.error(f"Database integrity error: {str(e)}")
-                    return jsonify({'error': f'Database error: {str(e)}'}), 500
-            
-            except Exception as e:
-                db.session.rollback()
-                cleanup_s3_file(file_key)
-                logger.error(f"Unexpected error during candidate creation: {str(e)}")
-                return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+            return save_candidate(parsed_data, file_key)
             
+    except WorkerPoolBusyError as e:
+        logger.warning(f"Rejected upload, worker pool busy: {str(e)}")
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         logger.error(f"Error processing resume: {str(e)}")
         cleanup_s3_file(file_key)
@@ -159,6 +93,140 @@ def upload_resume():
         if temp_file_path and os.path.exists(temp_file_path):
             os.unlink(temp_file_path)
 
+def check_duplicate_email(file_path, file_extension):
+    """Find an existing candidate from the resume's first email, without a full parse"""
+    email = run_cpu_bound(extract_email, file_path, file_extension, Config.DUPLICATE_CHECK_MAX_PAGES)
+    return find_existing_candidate(email)
+
+def duplicate_email_response(email, existing_candidate):
+    return jsonify({
+        'error': f'A candidate with email {email} already exists',
+        'existing_candidate_id': existing_candidate.candidate_id if existing_candidate else None,
+        'existing_candidate_name': existing_candidate.full_name if existing_candidate else None
+    }), 409
+
+def save_candidate(parsed_data, file_key):
+    """Store a parsed resume whose file is already in S3 at ``file_key``.
+    
+    Returns the JSON response for the upload. The S3 object is removed again
+    when the candidate is not created (duplicate email or any error).
+    """
+    normalized_email = parsed_data['email'].lower().strip()
+    
+    # Start a database transaction
+    try:
+        # Resolve skills against the dictionary and materialize the ranking profile
+        skills = normalize_skills(parsed_data.get('skills', []))
+        profile_text = build_candidate_text({
+            'full_name': parsed_data['full_name'],
+            'skills': skills,
+            'years_experience': parsed_data['years_experience'],
+            'education': [edu for edu in parsed_data.get('education', []) if edu.get('degree')]
+        })
+        
+        # Same person under another email? Flag it for review or flask merge-duplicates
+        signature = parsed_data.get('minhash')
+        near_duplicates = find_near_duplicates(signature) if signature is not None else []
+        duplicate_of_id, duplicate_score = near_duplicates[0] if near_duplicates else (None, None)
+        
+        # Insert unless the email is taken; the unique index on lower(email)
+        # arbitrates concurrent uploads without locking rows
+        candidate_id = Candidate.insert_if_absent(
+            full_name=parsed_data['full_name'],
+            email=normalized_email,
+            phone=parsed_data['phone'],
+            location=parsed_data['location'],
+            years_experience=parsed_data['years_experience'],
+            resume_file_path=file_key,
+            status='pending',
+            profile_text=profile_text,
+            duplicate_of_id=duplicate_of_id,
+            duplicate_score=duplicate_score
+        )
+        
+        if candidate_id is None:
+            # Clean up the uploaded file since we won't use it
+            db.session.rollback()
+            cleanup_s3_file(file_key)
+            return duplicate_email_response(parsed_data['email'], Candidate.find_by_email(normalized_email))
+        
+        if signature is not None:
+            store_signature(candidate_id, signature)
+        
+        feature_store = loaded_feature_store()
+        if use_pgvector() or feature_store is not None:
+            # The encoder service batches this with other requests on its own workers
+            embedding = encode_texts([profile_text])[0]
+            if use_pgvector():
+                store_candidate_embedding(candidate_id, embedding)
+        
+        # Add education records
+        for edu in parsed_data.get('education', []):
+            education = Education(
+                candidate_id=candidate_id,
+                degree=edu.get('degree', ''),
+                institution=edu.get('institution', ''),
+                graduation_year=edu.get('graduation_year'),
+                gpa=edu.get('gpa')
+            )
+            db.session.add(education)
+        
+        # Add skill records
+        for skill_data in skills:
+            skill = Skill(
+                candidate_id=candidate_id,
+                skill_name=skill_data['name'],
+                dictionary_id=skill_data['dictionary_id'],
+                skill_category=skill_data['category'],
+                proficiency_level=skill_data['proficiency']
+            )
+            db.session.add(skill)
+        
+        # Commit all changes
+        bump_versions('candidates')
+        db.session.commit()
+        get_known_emails().add(normalized_email)
+        if feature_store is not None:
+            # Rankable right away, without waiting for the next refresh
+            feature_store.upsert(
+                candidate_id,
+                parsed_data['years_experience'],
+                'pending',
+                [skill['dictionary_id'] for skill in skills if skill['dictionary_id'] is not None],
+                embedding,
+                profile_hash(profile_text)
+            )
+        
+        response = {
+            'message': 'Resume processed successfully',
+            'candidate_id': candidate_id,
+            'full_name': parsed_data['full_name'],
+            'email': normalized_email,
+            'years_experience': parsed_data['years_experience']
+        }
+        if duplicate_of_id is not None:
+            response['possible_duplicate_of'] = {'candidate_id': duplicate_of_id, 'similarity': duplicate_score}
+        return jsonify(response), 201
+        
+    except IntegrityError as e:
+        # Duplicate emails never get here: insert_if_absent reports them as None
+        db.session.rollback()
+        cleanup_s3_file(file_key)
+        logger.error(f"Database integrity error: {str(e)}")
+        return jsonify({'error': f'Database error: {str(e)}'}), 500
+    
+    except WorkerPoolBusyError as e:
+        db.session.rollback()
+        cleanup_s3_file(file_key)
+        logger.warning(f"Rejected upload, worker pool busy: {str(e)}")
+        return jsonify({'error': str(e)}), 503
+    
+    except Exception as e:
+        db.session.rollback()
+        cleanup_s3_file(file_key)
+        logger.error(f"Unexpected error during candidate creation: {str(e)}")
+        return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+
 def cleanup_s3_file(file_key):
     """Helper function to clean up S3 file on error"""
     if file_key:
@@ -174,12 +242,215 @@ def cleanup_s3_file(file_key):
         except Exception as cleanup_error:
             logger.error(f"Failed to cleanup S3 file {file_key}: {str(cleanup_error)}")
 
+def upload_session_status(upload_session, parts):
+    """Progress of a chunked upload, listing the parts still to send"""
+    return {
+        'upload_id': upload_session.id,
+        'filename': upload_session.filename,
+        'total_size': upload_session.total_size,
+        'part_size': upload_session.part_size,
+        'total_parts': upload_session.total_parts,
+        'uploaded_parts': sorted(parts),
+        'missing_parts': [number for number in range(1, upload_session.total_parts + 1)
+                          if number not in parts]
+    }
+
+def store_part(file_key, s3_upload_id, part_number, stream, size):
+    """Spool one part of the request body and send it to S3"""
+    with spool_stream(stream, size) as body:
+        return upload_part(file_key, s3_upload_id, part_number, body, size)
+
+@bp.route('/uploads', methods=['POST'])
+def initiate_upload():
+    """Start a chunked upload: the client then PUTs each part and calls complete"""
+    payload = request.get_json(silent=True) or {}
+    filename = secure_filename(payload.get('filename') or '')
+    total_size = payload.get('size')
+    
+    if not filename:
+        return jsonify({'error': 'filename is required'}), 400
+    
+    file_extension = os.path.splitext(filename)[1][1:].lower()
+    if file_extension not in ALLOWED_EXTENSIONS:
+        return jsonify({'error': 'Unsupported file type'}), 400
+    
+    if not isinstance(total_size, int) or isinstance(total_size, bool) or total_size <= 0:
+        return jsonify({'error': 'size must be a positive number of bytes'}), 400
+    
+    if total_size > Config.UPLOAD_MAX_FILE_SIZE:
+        return jsonify({'error': f'File size exceeds the {Config.UPLOAD_MAX_FILE_SIZE} byte limit'}), 413
+    
+    file_key = new_file_key(filename)
+    s3_upload_id = create_multipart_upload(file_key)
+    if not s3_upload_id:
+        return jsonify({'error': 'Failed to start upload to cloud storage'}), 500
+    
+    upload_session = UploadSession(
+        id=str(uuid.uuid4()),
+        s3_upload_id=s3_upload_id,
+        file_key=file_key,
+        filename=filename,
+        file_extension=file_extension,
+        total_size=total_size,
+        part_size=Config.UPLOAD_PART_SIZE
+    )
+    try:
+        db.session.add(upload_session)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        abort_multipart_upload(file_key, s3_upload_id)
+        logger.error(f"Error creating upload session: {str(e)}")
+        return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+    
+    return jsonify(upload_session_status(upload_session, {})), 201
+
+@bp.route('/uploads/<upload_id>', methods=['GET'])
+def upload_status(upload_id):
+    """Report which parts S3 already holds so an interrupted upload can resume"""
+    upload_session = UploadSession.query.get_or_404(upload_id)
+    try:
+        parts = list_uploaded_parts(upload_session.file_key, upload_session.s3_upload_id)
+    except Exception as e:
+        logger.error(f"Error listing parts for upload {upload_id}: {str(e)}")
+        return jsonify({'error': 'Failed to read upload progress from cloud storage'}), 502
+    return jsonify(upload_session_status(upload_session, parts))
+
+@bp.route('/uploads/<upload_id>/parts/<int:part_number>', methods=['PUT'])
+def upload_session_part(upload_id, part_number):
+    """Stream one part (raw request body) into the S3 multipart upload.
+    
+    Re-sending a part replaces it, so clients can simply retry failed parts.
+    """
+    upload_session = UploadSession.query.get_or_404(upload_id)
+    
+    if upload_session.status != 'uploading':
+        return jsonify({'error': 'Upload is being completed'}), 409
+    
+    if not 1 <= part_number <= upload_session.total_parts:
+        return jsonify({'error': f'part_number must be between 1 and {upload_session.total_parts}'}), 400
+    
+    size = request.content_length
+    if size is None:
+        return jsonify({'error': 'Content-Length header is required'}), 411
+    
+    expected_size = upload_session.expected_part_size(part_number)
+    if size != expected_size:
+        return jsonify({'error': f'Part {part_number} must be exactly {expected_size} bytes'}), 400
+    
+    try:
+        etag = store_part(
+            upload_session.file_key,
+            upload_session.s3_upload_id,
+            part_number,
+            request.stream,
+            size
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error uploading part {part_number} of upload {upload_id}: {str(e)}")
+        return jsonify({'error': 'Failed to upload part to cloud storage'}), 502
+    
+    return jsonify({'upload_id': upload_id, 'part_number': part_number, 'etag': etag})
+
+@bp.route('/uploads/<upload_id>/complete', methods=['POST'])
+def complete_upload(upload_id):
+    """Assemble the parts in S3, then parse and store the resume like /upload"""
+    upload_session = UploadSession.query.get_or_404(upload_id)
+    file_key = upload_session.file_key
+    
+    try:
+        parts = list_uploaded_parts(file_key, upload_session.s3_upload_id)
+    except Exception as e:
+        logger.error(f"Error listing parts for upload {upload_id}: {str(e)}")
+        return jsonify({'error': 'Failed to read upload progress from cloud storage'}), 502
+    
+    status = upload_session_status(upload_session, parts)
+    if status['missing_parts']:
+        return jsonify({'error': 'Upload is missing parts', **status}), 400
+    
+    wrong_size = [number for number, part in parts.items()
+                  if part['size'] != upload_session.expected_part_size(number)]
+    if wrong_size:
+        return jsonify({'error': 'Some parts have the wrong size and must be re-sent',
+                        'invalid_parts': sorted(wrong_size)}), 400
+    
+    # Claim the session so a concurrent complete call can't process the file twice.
+    # The row stays until S3 has assembled the file, so a crash in between leaves
+    # it for abort-stale-uploads to clean up.
+    s3_upload_id, file_extension = upload_session.s3_upload_id, upload_session.file_extension
+    claimed = UploadSession.query.filter_by(id=upload_id, status='uploading')\
+        .update({'status': 'completing'}, synchronize_session=False)
+    db.session.commit()
+    if not claimed:
+        return jsonify({'error': 'Upload is already being completed'}), 409
+    
+    try:
+        complete_multipart_upload(file_key, s3_upload_id, parts)
+    except Exception as e:
+        # Reopen the session so the client can retry
+        UploadSession.query.filter_by(id=upload_id).update({'status': 'uploading'}, synchronize_session=False)
+        db.session.commit()
+        logger.error(f"Error completing upload {upload_id}: {str(e)}")
+        return jsonify({'error': 'Failed to complete upload in cloud storage'}), 502
+    
+    UploadSession.query.filter_by(id=upload_id).delete()
+    db.session.commit()
+    
+    temp_file_path = None
+    try:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_extension}") as temp_file:
+            temp_file_path = temp_file.name
+        download_from_s3(file_key, temp_file_path)
+        
+        existing_candidate = check_duplicate_email(temp_file_path, file_extension)
+        if existing_candidate:
+            cleanup_s3_file(file_key)
+            return duplicate_email_response(existing_candidate.email, existing_candidate)
+        
+        parsed_data = run_cpu_bound(parse_resume, temp_file_path, file_extension)
+        if not parsed_data:
+            cleanup_s3_file(file_key)
+            return jsonify({'error': 'Failed to parse resume'}), 500
+        
+        if not parsed_data.get('email'):
+            cleanup_s3_file(file_key)
+            return jsonify({'error': 'No email found in resume'}), 400
+        
+        return save_candidate(parsed_data, file_key)
+    
+    except WorkerPoolBusyError as e:
+        cleanup_s3_file(file_key)
+        logger.warning(f"Rejected upload, worker pool busy: {str(e)}")
+        return jsonify({'error': str(e)}), 503
+    except Exception as e:
+        logger.error(f"Error processing resume: {str(e)}")
+        cleanup_s3_file(file_key)
+        return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+    finally:
+        if temp_file_path and os.path.exists(temp_file_path):
+            os.unlink(temp_file_path)
+
+@bp.route('/uploads/<upload_id>', methods=['DELETE'])
+def abort_upload(upload_id):
+    """Cancel a chunked upload and discard its parts"""
+    upload_session = UploadSession.query.get_or_404(upload_id)
+    if not abort_multipart_upload(upload_session.file_key, upload_session.s3_upload_id):
+        return jsonify({'error': 'Failed to abort upload in cloud storage'}), 502
+    
+    db.session.delete(upload_session)
+    db.session.commit()
+    return jsonify({'success': True, 'message': f'Upload {upload_id} aborted'})
+
 @bp.route('/candidates')
+@cached_page('candidates')
 def list_candidates():
     candidates = Candidate.query.all()
     return render_template('dashboard.html', candidates=candidates)
 
 @bp.route('/candidate/<int:candidate_id>')
+@cached_page('candidates')
 def candidate_detail(candidate_id):
     candidate = Candidate.query.get_or_404(candidate_id)
     educations = Education.query.filter_by(candidate_id=candidate_id).all()
@@ -188,7 +459,23 @@ def candidate_detail(candidate_id):
                          candidate=candidate, 
                          educations=educations, 
                          skills=skills,
-                         get_s3_url=get_s3_url)
+                         resume_url=get_s3_url(candidate.resume_file_path))
+
+def parse_candidate_filters(form):
+    """Read the optional structured candidate filters from a request form"""
+    filters = {'min_experience': None, 'status': form.get('status') or None}
+    if form.get('min_experience'):
+        try:
+            filters['min_experience'] = int(form['min_experience'])
+        except ValueError:
+            raise ValueError('min_experience must be an integer')
+    return filters
+
+def mark_shortlisted(candidate_ids):
+    """Mirror a committed status change into this process's feature store"""
+    feature_store = loaded_feature_store()
+    if feature_store is not None and candidate_ids:
+        feature_store.set_status(list(candidate_ids), 'shortlisted')
 
 @bp.route('/shortlist', methods=['POST'])
 def shortlist_candidates():
@@ -196,29 +483,29 @@ def shortlist_candidates():
     if not job_description_text:
         return jsonify({'error': 'Job description is required'}), 400
     
+    try:
+        filters = parse_candidate_filters(request.form)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
     # Create a new job description record
     jd = JobDescription(description=job_description_text)
     db.session.add(jd)
+    bump_versions('job_descriptions')
     db.session.commit()
     
-    # Get all candidates
-    candidates = Candidate.query.all()
-    candidates_data = []
-    
-    for candidate in candidates:
-        educations = Education.query.filter_by(candidate_id=candidate.candidate_id).all()
-        skills = Skill.query.filter_by(candidate_id=candidate.candidate_id).all()
-        
-        candidates_data.append({
-            'candidate_id': candidate.candidate_id,
-            'full_name': candidate.full_name,
-            'years_experience': candidate.years_experience,
-            'education': [{'degree': edu.degree} for edu in educations],
-            'skills': [{'name': skill.skill_name} for skill in skills]
-        })
-    
-    # Rank candidates and get top 10%
-    top_candidates = rank_candidates(job_description_text, candidates_data, top_percent=10)
+    if use_pgvector():
+        # Top-k selection and filters run inside Postgres; only winners are returned
+        total_candidates = count_indexed_candidates(**filters)
+        top_candidates = []
+        if total_candidates:
+            job_embedding = encode_texts([job_description_text])[0]
+            top_candidates = search_candidates(job_embedding, get_top_count(total_candidates, 10), **filters)
+    else:
+        # Score the in-process feature store: one matrix-vector product over stored embeddings
+        total_candidates, (top_candidates,) = rank_from_store(
+            encode_texts([job_description_text]), top_percent=10, **filters
+        )
     
     # Update status and create shortlist records
     for candidate in top_candidates:
@@ -232,22 +519,162 @@ def shortlist_candidates():
         )
         db.session.add(shortlist)
     
+    bump_versions('candidates', 'shortlists')
     db.session.commit()
+    mark_shortlisted([candidate['candidate_id'] for candidate in top_candidates])
     
     return jsonify({
         'message': f'Shortlisted top {len(top_candidates)} candidates (top 10%)',
         'top_candidates': top_candidates,
         'job_description_id': jd.id,
-        'total_candidates': len(candidates_data),
+        'total_candidates': total_candidates,
         'shortlisted_count': len(top_candidates)
     })
 
+def format_sse(event, data):
+    """Format a single server-sent event frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@bp.route('/shortlist/stream', methods=['POST'])
+def shortlist_candidates_stream():
+    job_description_text = request.form.get('job_description', '')
+    if not job_description_text:
+        return jsonify({'error': 'Job description is required'}), 400
+    
+    # Create a new job description record
+    jd = JobDescription(description=job_description_text)
+    db.session.add(jd)
+    bump_versions('job_descriptions')
+    db.session.commit()
+    jd_id = jd.id
+    
+    # Rank the feature store's stored embeddings; only the job description is encoded
+    candidate_ids = get_feature_store().matching_ids()
+    preview_size = Config.SHORTLIST_STREAM_PREVIEW_SIZE
+    
+    def generate():
+        yield format_sse('start', {
+            'job_description_id': jd_id,
+            'total_candidates': len(candidate_ids)
+        })
+        
+        top_candidates = []
+        try:
+            job_embedding = encode_texts([job_description_text])[0]
+            for update in iter_rank_from_store(job_embedding, candidate_ids, top_percent=10,
+                                               chunk_size=Config.SHORTLIST_STREAM_CHUNK_SIZE):
+                top_candidates = update['top_candidates']
+                yield format_sse('progress', {
+                    'processed': update['processed'],
+                    'total': update['total'],
+                    'top_candidates': top_candidates[:preview_size]
+                })
+            
+            # Persist only once the full pool has been scored
+            shortlisted_ids = [candidate['candidate_id'] for candidate in top_candidates]
+            if shortlisted_ids:
+                Candidate.query.filter(Candidate.candidate_id.in_(shortlisted_ids))\
+                    .update({'status': 'shortlisted'}, synchronize_session=False)
+            db.session.add_all([Shortlist(
+                job_description_id=jd_id,
+                candidate_id=candidate['candidate_id'],
+                score=candidate['similarity_score']
+            ) for candidate in top_candidates])
+            bump_versions('candidates', 'shortlists')
+            db.session.commit()
+            mark_shortlisted(shortlisted_ids)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error streaming shortlist: {str(e)}")
+            yield format_sse('error', {'error': f'An error occurred: {str(e)}'})
+            return
+        
+        yield format_sse('complete', {
+            'message': f'Shortlisted top {len(top_candidates)} candidates (top 10%)',
+            'job_description_id': jd_id,
+            'total_candidates': len(candidate_ids),
+            'shortlisted_count': len(top_candidates),
+            'top_candidates': top_candidates
+        })
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@bp.route('/shortlist/batch', methods=['POST'])
+def shortlist_candidates_batch():
+    payload = request.get_json(silent=True)
+    if payload is None:
+        payload = {}
+    elif not isinstance(payload, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    job_description_texts = payload.get('job_descriptions') or request.form.getlist('job_description')
+    
+    if not isinstance(job_description_texts, list):
+        return jsonify({'error': 'job_descriptions must be a list'}), 400
+    
+    job_description_texts = [text.strip() for text in job_description_texts
+                             if isinstance(text, str) and text.strip()]
+    if not job_description_texts:
+        return jsonify({'error': 'At least one job description is required'}), 400
+    
+    if len(job_description_texts) > Config.SHORTLIST_BATCH_MAX_JOBS:
+        return jsonify({
+            'error': f'At most {Config.SHORTLIST_BATCH_MAX_JOBS} job descriptions can be submitted at once'
+        }), 400
+    
+    try:
+        # Score every job description against the stored candidate embeddings together
+        total_candidates, ranked_per_job = rank_from_store(encode_texts(job_description_texts), top_percent=10)
+        
+        job_descriptions = [JobDescription(description=text) for text in job_description_texts]
+        db.session.add_all(job_descriptions)
+        db.session.flush()
+        
+        shortlisted_ids = set()
+        shortlists = []
+        for jd, top_candidates in zip(job_descriptions, ranked_per_job):
+            for candidate in top_candidates:
+                shortlisted_ids.add(candidate['candidate_id'])
+                shortlists.append(Shortlist(
+                    job_description_id=jd.id,
+                    candidate_id=candidate['candidate_id'],
+                    score=candidate['similarity_score']
+                ))
+        db.session.add_all(shortlists)
+        
+        if shortlisted_ids:
+            Candidate.query.filter(Candidate.candidate_id.in_(shortlisted_ids))\
+                .update({'status': 'shortlisted'}, synchronize_session=False)
+        
+        bump_versions('job_descriptions', 'shortlists', 'candidates')
+        db.session.commit()
+        mark_shortlisted(shortlisted_ids)
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error saving batch shortlist: {str(e)}")
+        return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+    
+    return jsonify({
+        'message': f'Shortlisted candidates for {len(job_descriptions)} job descriptions (top 10%)',
+        'total_candidates': total_candidates,
+        'results': [{
+            'job_description_id': jd.id,
+            'top_candidates': top_candidates,
+            'shortlisted_count': len(top_candidates)
+        } for jd, top_candidates in zip(job_descriptions, ranked_per_job)]
+    })
+
 @bp.route('/job_descriptions')
+@cached_page('job_descriptions', 'shortlists')
 def list_job_descriptions():
     job_descriptions = JobDescription.query.order_by(JobDescription.created_at.desc()).all()
     return render_template('job_descriptions.html', job_descriptions=job_descriptions)
 
 @bp.route('/job_description/<int:jd_id>')
+@cached_page('job_descriptions', 'shortlists', 'candidates')
 def job_description_detail(jd_id):
     job_description = JobDescription.query.get_or_404(jd_id)
     shortlisted_candidates = Shortlist.query.filter_by(job_description_id=jd_id)\
@@ -277,7 +704,11 @@ def delete_candidate(candidate_id):
         
         # Delete from database
         db.session.delete(candidate)
+        bump_versions('candidates', 'shortlists')
         db.session.commit()
+        feature_store = loaded_feature_store()
+        if feature_store is not None:
+            feature_store.remove([candidate_id])
         
         return jsonify({
             'success': True,
@@ -300,6 +731,7 @@ def delete_job_description(jd_id):
         
         # Then delete the job description
         db.session.delete(jd)
+        bump_versions('job_descriptions', 'shortlists')
         db.session.commit()
         return jsonify({
             'success': True,
@@ -318,6 +750,7 @@ def delete_shortlist(shortlist_id):
     
     try:
         db.session.delete(shortlist)
+        bump_versions('shortlists')
         db.session.commit()
         
         return jsonify({
@@ -329,4 +762,8 @@ def delete_shortlist(shortlist_id):
         return jsonify({
             'success': False,
             'error': f'Failed to delete shortlist record: {str(e)}'
-        }), 500
\ No newline at end of file
+        }), 500
+
+@bp.route('/metrics/encoder')
+def encoder_metrics():
+    return jsonify(get_encoder().metrics())
@@ -24,19 +24,23 @@ function setupUploadForm() {
                 throw new Error('Please select a file to upload');
             }
             
-            // Validate file size (5MB max)
-            if (fileInput.files[0].size > 5 * 1024 * 1024) {
-                throw new Error('File size exceeds 5MB limit');
+            const file = fileInput.files[0];
+            let response;
+            if (file.size > CHUNKED_UPLOAD_THRESHOLD) {
+                // Large files go up in parts and resume where they stopped
+                response = await uploadInChunks(file, function(done, total) {
+                    submitBtn.innerHTML = `<span class="spinner-border spinner-border-sm" role="status" aria-hidden="true"></span> Uploading part ${done} of ${total}...`;
+                });
+            } else {
+                const formData = new FormData();
+                formData.append('resume', file);
+                
+                response = await fetch('/upload', {
+                    method: 'POST',
+                    body: formData
+                });
             }
             
-            const formData = new FormData();
-            formData.append('resume', fileInput.files[0]);
-            
-            const response = await fetch('/upload', {
-                method: 'POST',
-                body: formData
-            });
-            
             const data = await response.json();
             
             if (!response.ok || data.error) {
@@ -65,6 +69,70 @@ function setupUploadForm() {
     });
 }
 
+// Files above this size use the resumable chunked upload API
+const CHUNKED_UPLOAD_THRESHOLD = 5 * 1024 * 1024;
+
+// Upload a file through /uploads in parts. The upload id is kept in localStorage
+// so a retry after a dropped connection only sends the parts S3 doesn't have yet.
+async function uploadInChunks(file, onProgress) {
+    const storageKey = `upload:${file.name}:${file.size}:${file.lastModified}`;
+    let status = null;
+    
+    const savedId = localStorage.getItem(storageKey);
+    if (savedId) {
+        const response = await fetch(`/uploads/${savedId}`);
+        if (response.ok) {
+            status = await response.json();
+        } else {
+            localStorage.removeItem(storageKey);
+        }
+    }
+    
+    if (!status) {
+        const response = await fetch('/uploads', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({filename: file.name, size: file.size})
+        });
+        if (!response.ok) {
+            return response;
+        }
+        status = await response.json();
+        localStorage.setItem(storageKey, status.upload_id);
+    }
+    
+    let done = status.uploaded_parts.length;
+    for (const partNumber of status.missing_parts) {
+        const start = (partNumber - 1) * status.part_size;
+        const body = file.slice(start, Math.min(start + status.part_size, file.size));
+        
+        let response;
+        for (let attempt = 1; attempt <= 3; attempt++) {
+            try {
+                response = await fetch(`/uploads/${status.upload_id}/parts/${partNumber}`, {
+                    method: 'PUT',
+                    headers: {'Content-Type': 'application/octet-stream'},
+                    body: body
+                });
+                if (response.ok || response.status < 500) break;
+            } catch (error) {
+                if (attempt === 3) throw error;
+            }
+        }
+        if (!response.ok) {
+            return response;
+        }
+        onProgress(++done, status.total_parts);
+    }
+    
+    const response = await fetch(`/uploads/${status.upload_id}/complete`, {method: 'POST'});
+    if (response.status !== 502) {
+        // Anything but a storage hiccup consumes or invalidates the upload
+        localStorage.removeItem(storageKey);
+    }
+    return response;
+}
+
 // Handle shortlist form
 function setupShortlistForm() {
     const shortlistForm = document.getElementById('shortlistForm');
@@ -89,7 +157,7 @@ function setupShortlistForm() {
                 throw new Error('Job description is required');
             }
             
-            const response = await fetch('/shortlist', {
+            const response = await fetch('/shortlist/stream', {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/x-www-form-urlencoded',
@@ -97,29 +165,37 @@ function setupShortlistForm() {
                 body: `job_description=${encodeURIComponent(jobDescription)}`
             });
             
-            const data = await response.json();
-            
-            if (!response.ok || data.error) {
+            if (!response.ok) {
+                const data = await response.json();
                 showAlert(resultDiv, 'danger', data.error || 'Failed to shortlist candidates');
-            } else {
-                resultDiv.innerHTML = `
-                    <div class="alert alert-success">
-                        <h4 class="alert-heading">
-                            <i class="bi bi-check-circle-fill me-2"></i>Shortlisting Complete!
-                        </h4>
-                        <p>${data.message}</p>
-                        <hr>
-                        <div class="d-flex justify-content-between">
-                            <button class="btn btn-sm btn-success" onclick="window.location.reload()">
-                                <i class="bi bi-arrow-clockwise me-1"></i>Refresh Page
-                            </button>
-                            <a href="/job_descriptions" class="btn btn-sm btn-outline-success">
-                                <i class="bi bi-list-ul me-1"></i>View All Job Descriptions
-                            </a>
-                        </div>
-                    </div>
-                `;
+                return;
             }
+            
+            await readEventStream(response, function(event, data) {
+                if (event === 'progress') {
+                    showShortlistProgress(resultDiv, data);
+                } else if (event === 'error') {
+                    showAlert(resultDiv, 'danger', data.error || 'Failed to shortlist candidates');
+                } else if (event === 'complete') {
+                    resultDiv.innerHTML = `
+                        <div class="alert alert-success">
+                            <h4 class="alert-heading">
+                                <i class="bi bi-check-circle-fill me-2"></i>Shortlisting Complete!
+                            </h4>
+                            <p>${data.message}</p>
+                            <hr>
+                            <div class="d-flex justify-content-between">
+                                <button class="btn btn-sm btn-success" onclick="window.location.reload()">
+                                    <i class="bi bi-arrow-clockwise me-1"></i>Refresh Page
+                                </button>
+                                <a href="/job_description/${data.job_description_id}" class="btn btn-sm btn-outline-success">
+                                    <i class="bi bi-list-ul me-1"></i>View Shortlist
+                                </a>
+                            </div>
+                        </div>
+                    `;
+                }
+            });
         } catch (error) {
             console.error('Shortlist error:', error);
             showAlert(resultDiv, 'danger', error.message || 'Failed to shortlist candidates');
@@ -131,11 +207,63 @@ function setupShortlistForm() {
     });
 }
 
+// Read a server-sent event stream from a fetch response
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        
+        buffer += decoder.decode(value, { stream: true });
+        const frames = buffer.split('\n\n');
+        buffer = frames.pop();
+        
+        for (const frame of frames) {
+            let event = 'message';
+            let data = '';
+            for (const line of frame.split('\n')) {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            }
+            if (data) onEvent(event, JSON.parse(data));
+        }
+    }
+}
+
+function showShortlistProgress(container, data) {
+    const percent = Math.round((data.processed / data.total) * 100);
+    const rows = data.top_candidates.map(candidate => `
+        <li class="list-group-item d-flex justify-content-between">
+            <span>${escapeHtml(candidate.full_name)}</span>
+            <span class="badge bg-primary">${candidate.similarity_score.toFixed(3)}</span>
+        </li>
+    `).join('');
+    
+    container.innerHTML = `
+        <div class="progress mb-2">
+            <div class="progress-bar" role="progressbar" style="width: ${percent}%">
+                ${data.processed} / ${data.total}
+            </div>
+        </div>
+        <ul class="list-group">${rows}</ul>
+    `;
+}
+
 // Helper functions
+function escapeHtml(value) {
+    // Names come from parsed resumes; never interpret them as markup
+    const span = document.createElement('span');
+    span.textContent = value == null ? '' : String(value);
+    return span.innerHTML;
+}
+
 function showAlert(container, type, message) {
     container.innerHTML = `
         <div class="alert alert-${type} alert-dismissible fade show">
-            <strong>${type === 'danger' ? 'Error!' : 'Notice:'}</strong> ${message}
+            <strong>${type === 'danger' ? 'Error!' : 'Notice:'}</strong> ${escapeHtml(message)}
             <button type="button" class="btn-close" data-bs-dismiss="alert" aria-label="Close"></button>
         </div>
     `;
@@ -175,10 +303,10 @@ function showSuccessMessage(data) {
             <h4 class="alert-heading">
                 <i class="bi bi-check-circle-fill me-2"></i>Success!
             </h4>
-            <p>Resume processed successfully for candidate: <strong>${data.full_name || 'Unknown'}</strong></p>
+            <p>Resume processed successfully for candidate: <strong>${escapeHtml(data.full_name || 'Unknown')}</strong></p>
             <p class="mb-0">
                 <small class="text-muted">
-                    Email: ${data.email || 'N/A'} | Experience: ${data.years_experience || '0'} years
+                    Email: ${escapeHtml(data.email || 'N/A')} | Experience: ${data.years_experience || '0'} years
                 </small>
             </p>
             <hr>
@@ -212,10 +340,10 @@ function addRecentUpload(data) {
     uploadItem.className = 'list-group-item list-group-item-action';
     uploadItem.innerHTML = `
         <div class="d-flex w-100 justify-content-between">
-            <h5 class="mb-1">${data.full_name || 'New Candidate'}</h5>
+            <h5 class="mb-1">${escapeHtml(data.full_name || 'New Candidate')}</h5>
             <small class="text-success">${uploadTime}</small>
         </div>
-        <p class="mb-1">${data.email || 'No email provided'}</p>
+        <p class="mb-1">${escapeHtml(data.email || 'No email provided')}</p>
         <small class="text-muted">
             <i class="bi bi-briefcase me-1"></i>${data.years_experience || '0'} years experience
         </small>
@@ -0,0 +1,206 @@
+from app.config import Config
+from app.models import db, Candidate, CandidateSignature, CandidateLshBucket, Education, Skill, Shortlist
+from app.utils.minhash import band_hashes, estimate_similarity
+import numpy as np
+import hashlib
+import math
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives)"""
+
+    def __init__(self, capacity, error_rate=0.01):
+        self.capacity = capacity
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class KnownEmails:
+    """In-process Bloom filter of candidate emails, kept in sync with the candidates table.
+
+    A negative answer means the email was not in the table at the last sync, so
+    the upload can skip the database lookup. Rows inserted by other processes
+    are picked up incrementally (by candidate_id) every ``refresh_seconds``;
+    anything newer is still caught by the unique index on insert.
+    """
+
+    def __init__(self, capacity, error_rate=0.01, refresh_seconds=30):
+        self.error_rate = error_rate
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._reset(capacity)
+
+    def _reset(self, capacity):
+        self._bloom = BloomFilter(capacity, self.error_rate)
+        self._last_candidate_id = 0
+        self._synced_at = None
+
+    def _sync(self):
+        rows = db.session.query(Candidate.candidate_id, db.func.lower(Candidate.email))\
+            .filter(Candidate.candidate_id > self._last_candidate_id)\
+            .order_by(Candidate.candidate_id)\
+            .yield_per(10000)
+        for candidate_id, email in rows:
+            self._bloom.add(email)
+            self._last_candidate_id = candidate_id
+        self._synced_at = time.monotonic()
+
+        if self._bloom.count > self._bloom.capacity:
+            # Past capacity the false-positive rate climbs; rebuild at double size
+            logger.info(f"Rebuilding known-email filter for {self._bloom.count} candidates")
+            self._reset(self._bloom.capacity * 2)
+            self._sync()
+
+    def might_exist(self, email):
+        """False only if no candidate had this email at the last sync"""
+        email = email.lower().strip()
+        with self._lock:
+            if self._synced_at is None or time.monotonic() - self._synced_at > self.refresh_seconds:
+                self._sync()
+            return email in self._bloom
+
+    def add(self, email):
+        """Record an email this process just inserted"""
+        with self._lock:
+            self._bloom.add(email.lower().strip())
+
+_known_emails = None
+_known_emails_lock = threading.Lock()
+
+def get_known_emails():
+    """Return the process-wide known-email filter"""
+    global _known_emails
+    if _known_emails is not None:
+        return _known_emails
+
+    with _known_emails_lock:
+        if _known_emails is None:
+            _known_emails = KnownEmails(
+                Config.KNOWN_EMAILS_CAPACITY,
+                error_rate=Config.KNOWN_EMAILS_ERROR_RATE,
+                refresh_seconds=Config.KNOWN_EMAILS_REFRESH_SECONDS
+            )
+    return _known_emails
+
+def find_existing_candidate(email):
+    """Return the candidate already using this email, or None.
+
+    The Bloom filter answers most new emails without a query; possible
+    matches are confirmed with the indexed lower(email) lookup.
+    """
+    if not email or not get_known_emails().might_exist(email):
+        return None
+    return Candidate.find_by_email(email)
+
+def store_signature(candidate_id, signature):
+    """Save a candidate's MinHash signature and its LSH buckets in the current transaction"""
+    CandidateLshBucket.query.filter_by(candidate_id=candidate_id).delete()
+    db.session.merge(CandidateSignature(candidate_id=candidate_id, signature=signature.tobytes()))
+    db.session.add_all([
+        CandidateLshBucket(band=band, bucket=bucket, candidate_id=candidate_id)
+        for band, bucket in enumerate(band_hashes(signature, Config.MINHASH_BANDS))
+    ])
+
+def find_near_duplicates(signature, exclude_id=None):
+    """Candidates whose resume text is likely the same as ``signature``'s.
+
+    LSH narrows the search to candidates sharing at least one band bucket
+    (indexed lookups, independent of pool size); those are then kept if
+    their estimated Jaccard similarity reaches NEAR_DUPLICATE_THRESHOLD.
+    At most NEAR_DUPLICATE_MAX_MATCHES candidates are compared, those sharing
+    the most bands first, so crowded buckets cannot crowd out the real match.
+    Returns [(candidate_id, similarity)] best first.
+    """
+    pairs = list(enumerate(band_hashes(signature, Config.MINHASH_BANDS)))
+    matches = db.session.query(CandidateLshBucket.candidate_id)\
+        .filter(db.tuple_(CandidateLshBucket.band, CandidateLshBucket.bucket).in_(pairs))
+    if exclude_id is not None:
+        matches = matches.filter(CandidateLshBucket.candidate_id != exclude_id)
+    candidate_ids = matches.group_by(CandidateLshBucket.candidate_id)\
+        .order_by(db.func.count().desc(), CandidateLshBucket.candidate_id)\
+        .limit(Config.NEAR_DUPLICATE_MAX_MATCHES).subquery()
+
+    rows = db.session.query(CandidateSignature.candidate_id, CandidateSignature.signature)\
+        .filter(CandidateSignature.candidate_id.in_(db.select(candidate_ids))).all()
+
+    scored = []
+    for candidate_id, stored in rows:
+        similarity = estimate_similarity(signature, np.frombuffer(stored, dtype=np.uint32))
+        if similarity >= Config.NEAR_DUPLICATE_THRESHOLD:
+            scored.append((candidate_id, similarity))
+    return sorted(scored, key=lambda match: match[1], reverse=True)
+
+def merge_candidate(duplicate, canonical):
+    """Fold ``duplicate`` into ``canonical`` and delete it, in the current transaction.
+
+    Skills, education and shortlist entries the canonical record lacks are
+    copied over, and empty contact fields are filled in. Returns the
+    duplicate's resume key so the caller can remove it from S3 after commit.
+    """
+    known_skills = {(skill.dictionary_id, skill.skill_name.lower() if skill.skill_name else None)
+                    for skill in canonical.skills}
+    for skill in duplicate.skills:
+        key = (skill.dictionary_id, skill.skill_name.lower() if skill.skill_name else None)
+        if key not in known_skills:
+            known_skills.add(key)
+            canonical.skills.append(Skill(
+                skill_name=skill.skill_name,
+                dictionary_id=skill.dictionary_id,
+                skill_category=skill.skill_category,
+                proficiency_level=skill.proficiency_level
+            ))
+
+    known_education = {(edu.degree, edu.institution) for edu in canonical.educations}
+    for edu in duplicate.educations:
+        if (edu.degree, edu.institution) not in known_education:
+            known_education.add((edu.degree, edu.institution))
+            canonical.educations.append(Education(
+                degree=edu.degree,
+                institution=edu.institution,
+                graduation_year=edu.graduation_year,
+                gpa=edu.gpa
+            ))
+
+    canonical.phone = canonical.phone or duplicate.phone
+    canonical.location = canonical.location or duplicate.location
+    years = [y for y in (canonical.years_experience, duplicate.years_experience) if y is not None]
+    canonical.years_experience = max(years) if years else None
+    if duplicate.status == 'shortlisted':
+        canonical.status = 'shortlisted'
+
+    # Move shortlist entries unless the canonical record is already on that list
+    shortlisted_for = db.select(Shortlist.job_description_id)\
+        .where(Shortlist.candidate_id == canonical.candidate_id).scalar_subquery()
+    Shortlist.query.filter(Shortlist.candidate_id == duplicate.candidate_id,
+                           ~Shortlist.job_description_id.in_(shortlisted_for))\
+        .update({'candidate_id': canonical.candidate_id}, synchronize_session=False)
+    Shortlist.query.filter_by(candidate_id=duplicate.candidate_id).delete(synchronize_session=False)
+
+    # Later duplicates of the merged record now point at the survivor
+    Candidate.query.filter(Candidate.duplicate_of_id == duplicate.candidate_id,
+                           Candidate.candidate_id != canonical.candidate_id)\
+        .update({'duplicate_of_id': canonical.candidate_id}, synchronize_session=False)
+
+    resume_file_path = duplicate.resume_file_path
+    db.session.delete(duplicate)
+    return resume_file_path
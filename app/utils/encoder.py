@@ -0,0 +1,244 @@
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from collections import deque
+from app.config import Config
+from app.utils.encoder_backends import load_backend
+import numpy as np
+import multiprocessing
+import threading
+import queue
+import time
+import atexit
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Model instance owned by the current worker (process or encoder thread)
+_worker_model = None
+
+def _init_worker(model_name, num_threads, backend):
+    """Load the sentence encoder once per worker with a fixed intra-op thread count"""
+    global _worker_model
+    import torch
+
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    _worker_model = load_backend(model_name, backend, num_threads=num_threads)
+
+def _encode_batch(texts):
+    """Encode one micro-batch inside a worker"""
+    started = time.perf_counter()
+    embeddings = _worker_model.encode(texts, batch_size=len(texts))
+    return embeddings.astype(np.float32, copy=False), time.perf_counter() - started
+
+class _EncodeRequest:
+    __slots__ = ('texts', 'future')
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.future = Future()
+
+class EncoderService:
+    """Coalesces encode requests from many threads into micro-batches.
+
+    Requests are queued and a dispatcher thread groups them into batches of up
+    to ``max_batch_size`` texts. A request that finds the workers idle and
+    nothing else queued is sent at once; while batches are in flight the
+    dispatcher waits up to ``max_wait_ms`` for a batch to fill. Each batch runs
+    on one of ``num_workers`` worker processes (or a single in-process thread
+    when ``num_workers`` is 0), with at most one batch in flight per worker.
+    ``dimension`` (``EMBEDDING_DIMENSION`` by default) shapes the result of an
+    empty request until the first batch reports the model's own.
+    """
+
+    def __init__(self, model_name, num_workers=0, threads_per_worker=1,
+                 max_batch_size=64, max_wait_ms=10, backend='torch', dimension=None):
+        self.num_workers = num_workers
+        self.backend = backend
+        self.dimension = dimension or Config.EMBEDDING_DIMENSION
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        if num_workers > 0:
+            self._executor = ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(model_name, threads_per_worker, backend)
+            )
+        else:
+            # In-process mode keeps the process-wide torch thread setting
+            self._executor = ThreadPoolExecutor(
+                max_workers=1,
+                initializer=_init_worker,
+                initargs=(model_name, None, backend)
+            )
+
+        self._queue = queue.Queue()
+        self._inflight = threading.BoundedSemaphore(max(1, num_workers))
+        self._running = 0
+        self._metrics_lock = threading.Lock()
+        self._recent = deque()
+        self._started_at = time.monotonic()
+        self._counts = {'requests': 0, 'texts': 0, 'batches': 0, 'errors': 0, 'encode_seconds': 0.0}
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name='encoder-dispatch', daemon=True)
+        self._dispatcher.start()
+
+    def encode(self, texts):
+        """Encode texts, blocking until every row is ready. Returns a float32 matrix."""
+        texts = list(texts)
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+
+        # Large requests are split so their parts can run on several workers
+        requests = []
+        for start in range(0, len(texts), self.max_batch_size):
+            request = _EncodeRequest(texts[start:start + self.max_batch_size])
+            self._queue.put(request)
+            requests.append(request)
+
+        with self._metrics_lock:
+            self._counts['requests'] += 1
+
+        return np.vstack([request.future.result() for request in requests])
+
+    def _dispatch_loop(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            batch = [first]
+            size = len(first.texts)
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch_size:
+                try:
+                    request = self._queue.get_nowait()
+                except queue.Empty:
+                    # Nothing else queued: a lone caller goes out now; only
+                    # while other batches run is it worth waiting for company
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0 or not self._busy():
+                        break
+                    try:
+                        request = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                if request is None:
+                    self._queue.put(None)
+                    break
+                if size + len(request.texts) > self.max_batch_size:
+                    # Does not fit; it starts the next batch instead
+                    self._dispatch(batch)
+                    batch, size = [request], len(request.texts)
+                    deadline = time.monotonic() + self.max_wait
+                    continue
+                batch.append(request)
+                size += len(request.texts)
+
+            self._dispatch(batch)
+
+    def _busy(self):
+        with self._metrics_lock:
+            return self._running > 0
+
+    def _dispatch(self, batch):
+        self._inflight.acquire()
+        texts = [text for request in batch for text in request.texts]
+        with self._metrics_lock:
+            self._running += 1
+        try:
+            future = self._executor.submit(_encode_batch, texts)
+        except Exception as e:
+            self._release()
+            self._fail(batch, e)
+            return
+        future.add_done_callback(lambda f: self._complete(batch, f))
+
+    def _release(self):
+        with self._metrics_lock:
+            self._running -= 1
+        self._inflight.release()
+
+    def _complete(self, batch, future):
+        self._release()
+        try:
+            embeddings, seconds = future.result()
+        except Exception as e:
+            logger.error(f"Encoder batch failed: {e}")
+            self._fail(batch, e)
+            return
+
+        self.dimension = embeddings.shape[1]
+        offset = 0
+        for request in batch:
+            request.future.set_result(embeddings[offset:offset + len(request.texts)])
+            offset += len(request.texts)
+
+        now = time.monotonic()
+        with self._metrics_lock:
+            self._counts['texts'] += offset
+            self._counts['batches'] += 1
+            self._counts['encode_seconds'] += seconds
+            self._recent.append((now, offset))
+            while self._recent and now - self._recent[0][0] > 60:
+                self._recent.popleft()
+
+    def _fail(self, batch, error):
+        with self._metrics_lock:
+            self._counts['errors'] += 1
+        for request in batch:
+            request.future.set_exception(error)
+
+    def metrics(self):
+        """Snapshot of throughput counters for monitoring"""
+        now = time.monotonic()
+        with self._metrics_lock:
+            counts = dict(self._counts)
+            recent_texts = sum(n for t, n in self._recent if now - t <= 60)
+
+        batches = counts['batches'] or 1
+        return {
+            'backend': self.backend,
+            'workers': self.num_workers,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'queue_depth': self._queue.qsize(),
+            'requests': counts['requests'],
+            'texts': counts['texts'],
+            'batches': counts['batches'],
+            'errors': counts['errors'],
+            'avg_batch_size': counts['texts'] / batches,
+            'avg_batch_latency_ms': counts['encode_seconds'] / batches * 1000,
+            'texts_per_second_1m': recent_texts / min(60, max(now - self._started_at, 1e-9)),
+            'uptime_seconds': now - self._started_at
+        }
+
+    def shutdown(self):
+        self._queue.put(None)
+        self._dispatcher.join(timeout=5)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+_encoder = None
+_encoder_lock = threading.Lock()
+
+def get_encoder():
+    """Return the process-wide encoder service, starting it on first use"""
+    global _encoder
+    if _encoder is not None:
+        return _encoder
+
+    with _encoder_lock:
+        if _encoder is None:
+            _encoder = EncoderService(
+                Config.ENCODER_MODEL_NAME,
+                num_workers=Config.ENCODER_WORKERS,
+                threads_per_worker=Config.ENCODER_THREADS_PER_WORKER,
+                max_batch_size=Config.ENCODER_MAX_BATCH_SIZE,
+                max_wait_ms=Config.ENCODER_MAX_WAIT_MS,
+                backend=Config.ENCODER_BACKEND,
+                dimension=Config.EMBEDDING_DIMENSION
+            )
+            atexit.register(_encoder.shutdown)
+            logger.info(f"Started encoder service with {Config.ENCODER_WORKERS} worker processes")
+    return _encoder
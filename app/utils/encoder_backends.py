@@ -0,0 +1,141 @@
+from app.config import Config
+import numpy as np
+import hashlib
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('torch', 'torch-int8', 'onnx', 'onnx-int8')
+
+class TorchBackend:
+    """PyTorch eager inference through sentence-transformers (reference path)"""
+
+    name = 'torch'
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name, device='cpu')
+
+    def encode(self, texts, batch_size=32):
+        return self.model.encode(texts, convert_to_numpy=True, batch_size=batch_size)
+
+class QuantizedTorchBackend(TorchBackend):
+    """PyTorch with dynamic int8 quantization of every Linear layer"""
+
+    name = 'torch-int8'
+
+    def __init__(self, model_name):
+        import torch
+        super().__init__(model_name)
+        self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+class OnnxBackend:
+    """ONNX Runtime inference of the exported transformer, with pooling in NumPy.
+
+    The transformer is exported once per model into ENCODER_ONNX_DIR and
+    reused by later workers. Mean pooling and the optional Normalize step of
+    the sentence-transformers pipeline are reproduced here.
+    """
+
+    name = 'onnx'
+
+    def __init__(self, model_name, num_threads=None, quantize=False):
+        import onnxruntime as ort
+        from sentence_transformers import SentenceTransformer
+        from sentence_transformers.models import Normalize, Pooling
+        self.name = 'onnx-int8' if quantize else 'onnx'
+
+        st_model = SentenceTransformer(model_name, device='cpu')
+        pooling = next((m for m in st_model if isinstance(m, Pooling)), None)
+        if pooling is None or not pooling.pooling_mode_mean_tokens:
+            raise ValueError(f'{model_name} does not use mean pooling, which the ONNX backend requires')
+
+        transformer = st_model[0]
+        self.tokenizer = transformer.tokenizer
+        self.max_seq_length = transformer.max_seq_length
+        self.normalize = any(isinstance(m, Normalize) for m in st_model)
+
+        path = self._export(model_name, transformer, quantize)
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+            options.inter_op_num_threads = 1
+        self.session = ort.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def _export(self, model_name, transformer, quantize):
+        """Export the transformer to ONNX (and quantize it) unless already cached"""
+        import torch
+
+        key = hashlib.sha1(model_name.encode()).hexdigest()[:12]
+        os.makedirs(Config.ENCODER_ONNX_DIR, exist_ok=True)
+        path = os.path.join(Config.ENCODER_ONNX_DIR, f'{key}.onnx')
+        quantized_path = os.path.join(Config.ENCODER_ONNX_DIR, f'{key}.int8.onnx')
+
+        if not os.path.exists(path):
+            sample = self.tokenizer(['export sample'], return_tensors='pt')
+            input_names = [n for n in ('input_ids', 'attention_mask', 'token_type_ids') if n in sample]
+            dynamic_axes = {n: {0: 'batch', 1: 'sequence'} for n in input_names}
+            dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+
+            # Write to a temp name first so concurrent workers never see a partial file
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            with torch.no_grad():
+                torch.onnx.export(
+                    transformer.auto_model,
+                    tuple(sample[n] for n in input_names),
+                    tmp_path,
+                    input_names=input_names,
+                    output_names=['last_hidden_state'],
+                    dynamic_axes=dynamic_axes,
+                    opset_version=14
+                )
+            os.replace(tmp_path, path)
+            logger.info(f"Exported {model_name} to {path}")
+
+        if not quantize:
+            return path
+
+        if not os.path.exists(quantized_path):
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            tmp_path = f'{quantized_path}.{os.getpid()}.tmp'
+            quantize_dynamic(path, tmp_path, weight_type=QuantType.QInt8)
+            os.replace(tmp_path, quantized_path)
+            logger.info(f"Quantized {model_name} to {quantized_path}")
+        return quantized_path
+
+    def encode(self, texts, batch_size=32):
+        results = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors='np'
+            )
+            feeds = {name: encoded[name].astype(np.int64) for name in self.input_names}
+            hidden = self.session.run(None, feeds)[0]
+
+            mask = encoded['attention_mask'][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if self.normalize:
+                pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            results.append(pooled.astype(np.float32))
+        return np.vstack(results)
+
+def load_backend(model_name, backend='torch', num_threads=None):
+    """Create the configured encoder backend, falling back to PyTorch if unavailable"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown encoder backend '{backend}', expected one of {', '.join(BACKENDS)}")
+
+    try:
+        if backend == 'torch-int8':
+            return QuantizedTorchBackend(model_name)
+        if backend in ('onnx', 'onnx-int8'):
+            return OnnxBackend(model_name, num_threads=num_threads, quantize=backend == 'onnx-int8')
+    except (ImportError, ValueError) as e:
+        logger.warning(f"Encoder backend '{backend}' unavailable, using torch: {e}")
+
+    return TorchBackend(model_name)
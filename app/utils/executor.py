@@ -0,0 +1,52 @@
+from concurrent.futures import ProcessPoolExecutor
+from app.config import Config
+import multiprocessing
+import threading
+import atexit
+import logging
+
+logger = logging.getLogger(__name__)
+
+class WorkerPoolBusyError(RuntimeError):
+    """Raised when the CPU worker pool has no free slot within the timeout"""
+
+_pool = None
+_pool_lock = threading.Lock()
+_pending_slots = threading.BoundedSemaphore(max(1, Config.CPU_WORKER_MAX_PENDING))
+
+def get_process_pool():
+    """Return the shared process pool, or None when CPU work runs in-thread"""
+    global _pool
+    if Config.CPU_WORKERS <= 0:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            # spawn avoids forking a parent that already holds torch/spaCy threads
+            _pool = ProcessPoolExecutor(
+                max_workers=Config.CPU_WORKERS,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+            logger.info(f"Started CPU worker pool with {Config.CPU_WORKERS} processes")
+    return _pool
+
+def run_cpu_bound(func, *args):
+    """Run CPU-heavy work (parsing, embedding) in the bounded process pool.
+
+    The request thread blocks on the result, but the work no longer holds
+    its process's GIL, so other threads keep serving requests. At most
+    CPU_WORKER_MAX_PENDING jobs may be queued or running; callers wait up to
+    CPU_WORKER_QUEUE_TIMEOUT seconds for a slot before giving up.
+    """
+    pool = get_process_pool()
+    if pool is None:
+        return func(*args)
+
+    if not _pending_slots.acquire(timeout=Config.CPU_WORKER_QUEUE_TIMEOUT):
+        raise WorkerPoolBusyError('All CPU workers are busy, try again shortly')
+
+    try:
+        return pool.submit(func, *args).result()
+    finally:
+        _pending_slots.release()
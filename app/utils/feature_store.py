@@ -0,0 +1,417 @@
+from app.config import Config
+from app.models import db, Candidate, Education, Skill
+from app.utils.shortlister import get_candidate_text, encode_texts, get_top_count, _normalize_rows
+from datetime import timedelta
+import numpy as np
+import hashlib
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Rows changed within this window before the last sync are re-checked, so
+# transactions that commit late are not missed
+_SYNC_OVERLAP = timedelta(seconds=60)
+_LOAD_BATCH_SIZE = 1024
+
+def profile_hash(text):
+    """64-bit fingerprint of a profile text, to tell when an embedding is stale"""
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class CandidateFeatureStore:
+    """Columnar, in-process copy of what shortlisting needs for every candidate.
+
+    Each column is a NumPy array indexed by row: candidate id, years of
+    experience (-1 when unknown), status code, skill dictionary ids (CSR
+    layout over one flat array) and the unit-normalized profile embedding,
+    so the embedding row of a candidate is its store row. Deleting swaps the
+    last row into the gap, keeping the columns dense.
+
+    ``refresh`` brings the store up to date with the candidates table
+    incrementally; writers in this process can also call ``upsert``,
+    ``remove`` and ``set_status`` directly.
+    """
+
+    def __init__(self, dimension, capacity=1024):
+        self.dimension = dimension
+        self.size = 0
+        self._lock = threading.RLock()
+        self._statuses = []
+        self._status_codes = {}
+        self._sorted = None
+
+        self.ids = np.empty(capacity, dtype=np.int32)
+        self.years_experience = np.empty(capacity, dtype=np.int16)
+        self.status = np.empty(capacity, dtype=np.uint8)
+        self.profile_hashes = np.empty(capacity, dtype=np.uint64)
+        self.skill_offsets = np.empty(capacity, dtype=np.int64)
+        self.skill_counts = np.empty(capacity, dtype=np.int32)
+        self.skill_ids = np.empty(capacity * 4, dtype=np.int32)
+        self._skill_used = 0
+        self.embeddings = np.empty((capacity, dimension), dtype=np.float32)
+
+        self._last_stats = None
+        self._synced_at = None
+        self._max_id = 0
+        self._updated_watermark = None
+
+    # Storage
+
+    def _status_code(self, status):
+        status = status or 'pending'
+        if status not in self._status_codes:
+            self._status_codes[status] = len(self._statuses)
+            self._statuses.append(status)
+        return self._status_codes[status]
+
+    def _grow(self, rows):
+        capacity = len(self.ids)
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2)
+        for name in ('ids', 'years_experience', 'status', 'profile_hashes', 'skill_offsets', 'skill_counts'):
+            column = getattr(self, name)
+            grown = np.empty(new_capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            setattr(self, name, grown)
+        embeddings = np.empty((new_capacity, self.dimension), dtype=np.float32)
+        embeddings[:self.size] = self.embeddings[:self.size]
+        self.embeddings = embeddings
+
+    def _flat_skill_positions(self):
+        """Positions in skill_ids of every live (row, skill) pair, row by row"""
+        counts = self.skill_counts[:self.size]
+        within_row = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(self.skill_offsets[:self.size], counts) + within_row
+
+    def _store_skills(self, skill_lists):
+        """Append skill id lists to the flat array; returns their offsets"""
+        counts = np.array([len(skill_ids) for skill_ids in skill_lists], dtype=np.int64)
+        flat = np.fromiter((skill_id for skill_ids in skill_lists for skill_id in skill_ids),
+                           dtype=np.int32, count=int(counts.sum()))
+        if self._skill_used + len(flat) > len(self.skill_ids):
+            # Drop ids orphaned by updates and deletes, then grow if still short
+            live = self.skill_ids[self._flat_skill_positions()]
+            self.skill_offsets[:self.size] = np.cumsum(self.skill_counts[:self.size]) - self.skill_counts[:self.size]
+            grown = np.empty(max(len(self.skill_ids), 2 * (len(live) + len(flat))), dtype=np.int32)
+            grown[:len(live)] = live
+            self.skill_ids = grown
+            self._skill_used = len(live)
+
+        offsets = self._skill_used + np.cumsum(counts) - counts
+        self.skill_ids[self._skill_used:self._skill_used + len(flat)] = flat
+        self._skill_used += len(flat)
+        return offsets
+
+    def _rows_of(self, candidate_ids):
+        """Store rows of the given candidate ids (-1 where absent)"""
+        candidate_ids = np.asarray(candidate_ids, dtype=np.int32)
+        if self.size == 0:
+            return np.full(len(candidate_ids), -1, dtype=np.int64)
+        if self._sorted is None:
+            order = np.argsort(self.ids[:self.size], kind='stable')
+            self._sorted = (self.ids[:self.size][order], order)
+        sorted_ids, order = self._sorted
+        positions = np.searchsorted(sorted_ids, candidate_ids).clip(max=len(sorted_ids) - 1)
+        return np.where(sorted_ids[positions] == candidate_ids, order[positions], -1)
+
+    def upsert_many(self, candidate_ids, years_experience, statuses, skill_lists, embeddings, profile_text_hashes):
+        """Add candidates, or replace the features of those already present"""
+        embeddings = _normalize_rows(np.asarray(embeddings, dtype=np.float32).reshape(len(candidate_ids), -1))
+        with self._lock:
+            rows = self._rows_of(candidate_ids)
+            new = rows < 0
+            if new.any():
+                self._grow(self.size + int(new.sum()))
+                rows[new] = np.arange(self.size, self.size + int(new.sum()))
+                self.size += int(new.sum())
+                self._sorted = None
+
+            self.ids[rows] = candidate_ids
+            self.years_experience[rows] = [-1 if years is None else years for years in years_experience]
+            self.status[rows] = [self._status_code(status) for status in statuses]
+            self.profile_hashes[rows] = np.asarray(profile_text_hashes, dtype=np.uint64)
+            # Old skill lists of these rows become garbage for the next compaction
+            self.skill_counts[rows] = 0
+            self.skill_offsets[rows] = self._store_skills(skill_lists)
+            self.skill_counts[rows] = [len(skill_ids) for skill_ids in skill_lists]
+            self.embeddings[rows] = embeddings
+
+    def upsert(self, candidate_id, years_experience, status, skill_ids, embedding, profile_text_hash=0):
+        """Add or replace a single candidate"""
+        self.upsert_many([candidate_id], [years_experience], [status], [skill_ids], [embedding], [profile_text_hash])
+
+    def remove(self, candidate_ids):
+        """Drop candidates, moving the last rows into the freed slots"""
+        with self._lock:
+            rows = self._rows_of(candidate_ids)
+            for row in sorted((int(r) for r in rows if r >= 0), reverse=True):
+                last = self.size - 1
+                if row != last:
+                    for column in (self.ids, self.years_experience, self.status, self.profile_hashes,
+                                   self.skill_offsets, self.skill_counts, self.embeddings):
+                        column[row] = column[last]
+                self.size -= 1
+            self._sorted = None
+
+    def set_status(self, candidate_ids, status):
+        with self._lock:
+            rows = self._rows_of(candidate_ids)
+            self.status[rows[rows >= 0]] = self._status_code(status)
+
+    def nbytes(self):
+        """Bytes used by the live part of every column"""
+        n = self.size
+        return (self.ids[:n].nbytes + self.years_experience[:n].nbytes + self.status[:n].nbytes
+                + self.profile_hashes[:n].nbytes + self.skill_offsets[:n].nbytes
+                + self.skill_counts[:n].nbytes + self.skill_ids[:self._skill_used].nbytes
+                + self.embeddings[:n].nbytes)
+
+    # Scoring
+
+    def filter_mask(self, min_experience=None, status=None, skill_ids=None):
+        """Boolean row mask for the structured filters, or None when unfiltered"""
+        n = self.size
+        mask = None
+        if min_experience is not None:
+            mask = self.years_experience[:n] >= min_experience
+        if status:
+            code = self._status_codes.get(status)
+            status_mask = np.zeros(n, dtype=bool) if code is None else self.status[:n] == code
+            mask = status_mask if mask is None else mask & status_mask
+        if skill_ids:
+            # Rows having every requested skill, via the flattened (row, skill) pairs
+            row_of_pair = np.repeat(np.arange(n), self.skill_counts[:n])
+            pair_skill_ids = self.skill_ids[self._flat_skill_positions()]
+            hits = np.zeros(n, dtype=np.int32)
+            for skill_id in set(skill_ids):
+                hits[np.unique(row_of_pair[pair_skill_ids == skill_id])] += 1
+            skill_mask = hits == len(set(skill_ids))
+            mask = skill_mask if mask is None else mask & skill_mask
+        return mask
+
+    def top_candidates(self, job_embeddings, top_percent=10, chunk_size=4096, **filters):
+        """Rank the (filtered) pool against each job embedding.
+
+        Returns ``(pool_size, [[(candidate_id, score), ...] per job])`` with
+        the top ``top_percent`` of the pool, best first.
+        """
+        job_embeddings = _normalize_rows(np.asarray(job_embeddings, dtype=np.float32))
+        with self._lock:
+            mask = self.filter_mask(**filters)
+            rows = np.arange(self.size) if mask is None else np.flatnonzero(mask)
+            total = len(rows)
+            if not total:
+                return 0, [[] for _ in job_embeddings]
+
+            # Embeddings are stored normalized, so cosine similarity is a dot product
+            scores = np.empty((len(job_embeddings), total), dtype=np.float32)
+            for start in range(0, total, chunk_size):
+                chunk_rows = rows[start:start + chunk_size]
+                chunk = self.embeddings[chunk_rows[0]:chunk_rows[-1] + 1] if mask is None \
+                    else self.embeddings[chunk_rows]
+                scores[:, start:start + len(chunk_rows)] = job_embeddings @ chunk.T
+            candidate_ids = self.ids[rows]
+
+        top_count = get_top_count(total, top_percent)
+        results = []
+        for row in scores:
+            top = np.argpartition(-row, top_count - 1)[:top_count]
+            top = top[np.argsort(-row[top], kind='stable')]
+            results.append([(int(candidate_ids[i]), float(row[i])) for i in top])
+        return total, results
+
+    def matching_ids(self, **filters):
+        """Snapshot of the candidate ids that pass the structured filters"""
+        with self._lock:
+            mask = self.filter_mask(**filters)
+            ids = self.ids[:self.size]
+            return (ids if mask is None else ids[mask]).copy()
+
+    def iter_top_candidates(self, job_embedding, candidate_ids, top_percent=10, chunk_size=256):
+        """Score ``candidate_ids`` chunk by chunk, yielding the running top X% after each chunk.
+
+        Yields ``(processed, total, [(candidate_id, score), ...])``. The lock is
+        taken per chunk, so a slow consumer does not hold up writers;
+        candidates removed meanwhile are skipped.
+        """
+        job_embedding = _normalize_rows(np.asarray(job_embedding, dtype=np.float32).reshape(1, -1))[0]
+        total = len(candidate_ids)
+        top_count = get_top_count(total, top_percent)
+        best_ids = np.empty(0, dtype=np.int32)
+        best_scores = np.empty(0, dtype=np.float32)
+
+        for start in range(0, total, chunk_size):
+            chunk_ids = np.asarray(candidate_ids[start:start + chunk_size], dtype=np.int32)
+            with self._lock:
+                rows = self._rows_of(chunk_ids)
+                present = rows >= 0
+                chunk_scores = self.embeddings[rows[present]] @ job_embedding
+
+            # Merge this chunk into the running top-k
+            ids = np.concatenate([best_ids, chunk_ids[present]])
+            scores = np.concatenate([best_scores, chunk_scores])
+            keep = min(top_count, len(scores))
+            if keep:
+                order = np.argpartition(-scores, keep - 1)[:keep]
+                order = order[np.argsort(-scores[order], kind='stable')]
+                best_ids, best_scores = ids[order], scores[order]
+            yield start + len(chunk_ids), total, [(int(i), float(s)) for i, s in zip(best_ids, best_scores)]
+
+    # Database sync
+
+    def _load(self, query):
+        """Load candidates from a query, re-encoding only changed profiles (caller holds the lock)"""
+        candidates = query.all()
+        for start in range(0, len(candidates), _LOAD_BATCH_SIZE):
+            batch = candidates[start:start + _LOAD_BATCH_SIZE]
+            ids = [c.candidate_id for c in batch]
+
+            skills_by_candidate = {}
+            for candidate_id, skill_name, dictionary_id in db.session.query(
+                    Skill.candidate_id, Skill.skill_name, Skill.dictionary_id).filter(Skill.candidate_id.in_(ids)):
+                skills_by_candidate.setdefault(candidate_id, []).append((skill_name, dictionary_id))
+            legacy_ids = [c.candidate_id for c in batch if not c.profile_text]
+            educations_by_candidate = {}
+            if legacy_ids:
+                for candidate_id, degree in db.session.query(Education.candidate_id, Education.degree)\
+                        .filter(Education.candidate_id.in_(legacy_ids)):
+                    educations_by_candidate.setdefault(candidate_id, []).append({'degree': degree})
+
+            texts = [get_candidate_text({
+                'profile_text': c.profile_text,
+                'full_name': c.full_name,
+                'years_experience': c.years_experience,
+                'skills': [{'name': name} for name, _ in skills_by_candidate.get(c.candidate_id, [])],
+                'education': educations_by_candidate.get(c.candidate_id, [])
+            }) for c in batch]
+            hashes = np.array([profile_hash(text) for text in texts], dtype=np.uint64)
+
+            # Keep embeddings whose profile text is unchanged
+            rows = self._rows_of(ids)
+            embeddings = np.empty((len(batch), self.dimension), dtype=np.float32)
+            known = rows >= 0
+            unchanged = known.copy()
+            unchanged[known] = self.profile_hashes[rows[known]] == hashes[known]
+            embeddings[unchanged] = self.embeddings[rows[unchanged]]
+            stale = np.flatnonzero(~unchanged)
+            if len(stale):
+                embeddings[stale] = encode_texts([texts[i] for i in stale])
+
+            self.upsert_many(
+                ids,
+                [c.years_experience for c in batch],
+                [c.status for c in batch],
+                [[d for _, d in skills_by_candidate.get(c.candidate_id, []) if d is not None] for c in batch],
+                embeddings,
+                hashes
+            )
+        return len(candidates)
+
+    def refresh(self, force=False):
+        """Apply inserts, updates and deletes made to the candidates table since the last sync"""
+        with self._lock:
+            if not force and self._synced_at is not None and \
+                    time.monotonic() - self._synced_at < Config.FEATURE_STORE_REFRESH_SECONDS:
+                return
+            stats = db.session.query(
+                db.func.max(Candidate.candidate_id), db.func.count(Candidate.candidate_id),
+                db.func.max(Candidate.updated_at)
+            ).one()
+            self._synced_at = time.monotonic()
+            if stats == self._last_stats:
+                return
+
+            max_id, count, max_updated = stats
+            columns = db.session.query(Candidate).options(db.load_only(
+                Candidate.candidate_id, Candidate.full_name, Candidate.years_experience,
+                Candidate.status, Candidate.profile_text
+            ))
+            changed = self._load(columns.filter(Candidate.candidate_id > self._max_id))
+            if self._updated_watermark is not None:
+                changed += self._load(columns.filter(
+                    Candidate.candidate_id <= self._max_id,
+                    Candidate.updated_at > self._updated_watermark - _SYNC_OVERLAP
+                ))
+
+            if count != self.size:
+                # Deleted rows, or ids committed out of order: reconcile the id sets
+                db_ids = np.fromiter((row[0] for row in db.session.query(Candidate.candidate_id)), dtype=np.int32)
+                present = self.ids[:self.size]
+                self.remove(present[~np.isin(present, db_ids)])
+                missing = db_ids[~np.isin(db_ids, present)]
+                if len(missing):
+                    self._load(columns.filter(Candidate.candidate_id.in_(missing.tolist())))
+
+            self._max_id = max(self._max_id, max_id or 0)
+            self._updated_watermark = max_updated
+            self._last_stats = stats
+            if changed:
+                logger.info(f"Feature store synced {changed} candidates ({self.size} total)")
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_feature_store():
+    """Return the process-wide feature store, building it on first use"""
+    global _store
+    if _store is None:
+        # Encoding the pool happens outside the lock; if two requests race on a
+        # cold start, the first finished store is kept and the other discarded
+        store = CandidateFeatureStore(Config.EMBEDDING_DIMENSION)
+        store.refresh(force=True)
+        with _store_lock:
+            if _store is None:
+                _store = store
+                logger.info(f"Built candidate feature store: {store.size} candidates, "
+                            f"{store.nbytes() / 1e6:.1f} MB")
+    _store.refresh()
+    return _store
+
+def loaded_feature_store():
+    """The feature store if this process has built one, else None (nothing to keep in sync)"""
+    return _store
+
+def rank_from_store(job_embeddings, top_percent=10, **filters):
+    """Rank with the feature store and attach names, in the /shortlist result format"""
+    total, ranked_per_job = get_feature_store().top_candidates(
+        job_embeddings, top_percent=top_percent, chunk_size=Config.SHORTLIST_CHUNK_SIZE, **filters
+    )
+    winner_ids = {candidate_id for ranked in ranked_per_job for candidate_id, _ in ranked}
+    details = {}
+    if winner_ids:
+        for candidate_id, full_name, years_experience in db.session.query(
+                Candidate.candidate_id, Candidate.full_name, Candidate.years_experience)\
+                .filter(Candidate.candidate_id.in_(winner_ids)):
+            details[candidate_id] = {'candidate_id': candidate_id, 'full_name': full_name,
+                                     'years_experience': years_experience}
+
+    return total, [[{
+        'candidate_id': candidate_id,
+        'similarity_score': score,
+        'data': details[candidate_id]
+    } for candidate_id, score in ranked if candidate_id in details] for ranked in ranked_per_job]
+
+def iter_rank_from_store(job_embedding, candidate_ids, top_percent=10, chunk_size=256):
+    """Stream the running ranking of ``candidate_ids``, with names, for /shortlist/stream.
+
+    Each update is a dict with ``processed``, ``total`` and a compact
+    ``top_candidates`` list (id, name and score only).
+    """
+    names = {}
+    for processed, total, ranked in get_feature_store().iter_top_candidates(
+            job_embedding, candidate_ids, top_percent=top_percent, chunk_size=chunk_size):
+        unnamed = [candidate_id for candidate_id, _ in ranked if candidate_id not in names]
+        if unnamed:
+            names.update(db.session.query(Candidate.candidate_id, Candidate.full_name)
+                         .filter(Candidate.candidate_id.in_(unnamed)))
+        yield {
+            'processed': processed,
+            'total': total,
+            'top_candidates': [{
+                'candidate_id': candidate_id,
+                'full_name': names[candidate_id],
+                'similarity_score': score
+            } for candidate_id, score in ranked if candidate_id in names]
+        }
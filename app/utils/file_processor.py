@@ -1,25 +1,40 @@
 import boto3
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 from datetime import datetime
 from app.config import Config
+import tempfile
+import threading
 import logging
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Shared client so concurrent requests reuse one HTTP connection pool
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
 def get_s3_client():
-    """Create and return an S3 client with error handling"""
-    try:
-        return boto3.client(
-            's3',
-            aws_access_key_id=Config.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=Config.AWS_SECRET_ACCESS_KEY,
-            region_name=Config.S3_REGION
-        )
-    except Exception as e:
-        logger.error(f"Error creating S3 client: {e}")
-        return None
+    """Return the shared S3 client, creating it on first use"""
+    global _s3_client
+    if _s3_client is not None:
+        return _s3_client
+    
+    with _s3_client_lock:
+        if _s3_client is None:
+            try:
+                _s3_client = boto3.client(
+                    's3',
+                    aws_access_key_id=Config.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=Config.AWS_SECRET_ACCESS_KEY,
+                    region_name=Config.S3_REGION,
+                    config=BotoConfig(max_pool_connections=Config.S3_MAX_POOL_CONNECTIONS)
+                )
+            except Exception as e:
+                logger.error(f"Error creating S3 client: {e}")
+                return None
+    return _s3_client
 
 def upload_to_s3(file, filename):
     """Upload file to S3 bucket with enhanced error handling"""
@@ -28,7 +43,7 @@ def upload_to_s3(file, filename):
         return None
 
     try:
-        file_key = f"resumes/{datetime.now().strftime('%Y%m%d_%H%M%S')}_{filename}"
+        file_key = new_file_key(filename)
         
         # Verify bucket exists first
         s3_client.head_bucket(Bucket=Config.S3_BUCKET_NAME)
@@ -66,4 +81,98 @@ def get_s3_url(file_key):
         return None
     
     # Use virtual-hosted style URL (recommended)
-    return f"https://{Config.S3_BUCKET_NAME}.s3.{Config.S3_REGION}.amazonaws.com/{file_key}"
\ No newline at end of file
+    return f"https://{Config.S3_BUCKET_NAME}.s3.{Config.S3_REGION}.amazonaws.com/{file_key}"
+
+def new_file_key(filename):
+    """Build the S3 key a resume is stored under"""
+    return f"resumes/{datetime.now().strftime('%Y%m%d_%H%M%S')}_{filename}"
+
+def create_multipart_upload(file_key):
+    """Start an S3 multipart upload and return its upload id"""
+    s3_client = get_s3_client()
+    if not s3_client:
+        return None
+
+    try:
+        response = s3_client.create_multipart_upload(Bucket=Config.S3_BUCKET_NAME, Key=file_key)
+        return response['UploadId']
+    except ClientError as e:
+        logger.error(f"S3 multipart initiate error: {e}")
+        return None
+
+def upload_part(file_key, upload_id, part_number, body, size):
+    """Upload one part of a multipart upload from a seekable file object. Returns its ETag."""
+    response = get_s3_client().upload_part(
+        Bucket=Config.S3_BUCKET_NAME,
+        Key=file_key,
+        UploadId=upload_id,
+        PartNumber=part_number,
+        Body=body,
+        ContentLength=size
+    )
+    return response['ETag']
+
+def list_uploaded_parts(file_key, upload_id):
+    """Return {part_number: {'etag', 'size'}} for the parts S3 has already stored"""
+    s3_client = get_s3_client()
+    parts = {}
+    marker = 0
+    while True:
+        response = s3_client.list_parts(
+            Bucket=Config.S3_BUCKET_NAME,
+            Key=file_key,
+            UploadId=upload_id,
+            PartNumberMarker=marker
+        )
+        for part in response.get('Parts', []):
+            parts[part['PartNumber']] = {'etag': part['ETag'], 'size': part['Size']}
+        if not response.get('IsTruncated'):
+            return parts
+        marker = response['NextPartNumberMarker']
+
+def complete_multipart_upload(file_key, upload_id, parts):
+    """Assemble the uploaded parts into the final object"""
+    get_s3_client().complete_multipart_upload(
+        Bucket=Config.S3_BUCKET_NAME,
+        Key=file_key,
+        UploadId=upload_id,
+        MultipartUpload={'Parts': [
+            {'PartNumber': number, 'ETag': parts[number]['etag']} for number in sorted(parts)
+        ]}
+    )
+
+def abort_multipart_upload(file_key, upload_id):
+    """Discard a multipart upload and any parts stored for it"""
+    try:
+        get_s3_client().abort_multipart_upload(
+            Bucket=Config.S3_BUCKET_NAME,
+            Key=file_key,
+            UploadId=upload_id
+        )
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] == 'NoSuchUpload':
+            return True
+        logger.error(f"S3 multipart abort error: {e}")
+        return False
+
+def download_from_s3(file_key, path):
+    """Stream an object from S3 to a local file"""
+    get_s3_client().download_file(Config.S3_BUCKET_NAME, file_key, path)
+
+def spool_stream(stream, size, chunk_size=64 * 1024):
+    """Copy exactly ``size`` bytes from a stream into a temp file, rewound for reading.
+
+    Only UPLOAD_SPOOL_MAX_MEMORY bytes are kept in memory; the rest goes to disk.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=Config.UPLOAD_SPOOL_MAX_MEMORY)
+    remaining = size
+    while remaining:
+        chunk = stream.read(min(chunk_size, remaining))
+        if not chunk:
+            spool.close()
+            raise ValueError(f'Request body ended {remaining} bytes short of {size}')
+        spool.write(chunk)
+        remaining -= len(chunk)
+    spool.seek(0)
+    return spool
@@ -0,0 +1,52 @@
+import numpy as np
+import hashlib
+import re
+
+# Changing any of these invalidates stored signatures (rerun flask index-signatures)
+NUM_PERM = 128
+SHINGLE_SIZE = 5
+SEED = 1
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# a, b < 2**32 and shingle hashes < 2**32, so a * x + b fits in uint64
+_rng = np.random.default_rng(SEED)
+_PERM_A = _rng.integers(1, _MAX_HASH, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _MAX_HASH, size=NUM_PERM, dtype=np.uint64)
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Set of overlapping word n-grams of normalized text"""
+    words = re.findall(r'[a-z0-9]+', text.lower())
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def minhash_signature(text):
+    """MinHash signature (uint32[NUM_PERM]) of the text's shingle set, or None if empty"""
+    items = shingles(text)
+    if not items:
+        return None
+
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(item.encode('utf-8'), digest_size=4).digest(), 'little')
+         for item in items),
+        dtype=np.uint64,
+        count=len(items)
+    )
+    # One row per permutation; the signature is each row's minimum
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+def band_hashes(signature, bands):
+    """One 63-bit bucket key per LSH band (rows = NUM_PERM / bands)"""
+    rows = len(signature) // bands
+    return [
+        int.from_bytes(hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(),
+                                       digest_size=8).digest(), 'little') >> 1
+        for band in range(bands)
+    ]
+
+def estimate_similarity(signature, other):
+    """Estimated Jaccard similarity: fraction of matching signature slots"""
+    return float(np.count_nonzero(signature == other)) / len(signature)
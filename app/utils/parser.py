@@ -3,16 +3,27 @@ from docx import Document
 import spacy
 import re
 from datetime import datetime
+from app.utils.minhash import minhash_signature
 
-nlp = spacy.load("en_core_web_lg")
+EMAIL_PATTERN = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
 
-def extract_text(file_path, file_extension):
-    """Extract text from different file formats"""
+# Loaded on first use so processes that never parse (e.g. encoder workers) skip it
+_nlp = None
+
+def get_nlp():
+    """Return the shared spaCy pipeline, loading it on first use"""
+    global _nlp
+    if _nlp is None:
+        _nlp = spacy.load("en_core_web_lg")
+    return _nlp
+
+def extract_text(file_path, file_extension, max_pages=None):
+    """Extract text from different file formats (PDFs only up to max_pages if given)"""
     text = ""
     try:
         if file_extension == 'pdf':
             with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
+                for page in pdf.pages[:max_pages]:
                     text += page.extract_text() or ""
         elif file_extension in ['docx', 'doc']:
             doc = Document(file_path)
@@ -91,7 +102,7 @@ def extract_work_experience(text):
 
 def extract_entities(text):
     """Extract entities using spaCy"""
-    doc = nlp(text)
+    doc = get_nlp()(text)
     
     # Extract entities
     entities = {
@@ -110,7 +121,7 @@ def extract_entities(text):
             entities[ent.label_].append(ent.text)
     
     # Improved email extraction
-    emails = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', text)
+    emails = EMAIL_PATTERN.findall(text)
     
     # Improved phone extraction - multiple patterns
     phone_patterns = [
@@ -127,12 +138,18 @@ def extract_entities(text):
         phones.extend(found_phones)
     
     if emails:
-        entities['EMAIL'] = list(set(emails))
+        # Keep document order so the first email matches extract_email()
+        entities['EMAIL'] = list(dict.fromkeys(emails))
     if phones:
         entities['PHONE'] = list(set(phones))
     
     return entities
 
+def extract_email(file_path, file_extension, max_pages=2):
+    """Cheap pre-parse: the first email address in the first pages, without NER"""
+    match = EMAIL_PATTERN.search(extract_text(file_path, file_extension, max_pages=max_pages))
+    return match.group() if match else None
+
 def parse_resume(file_path, file_extension):
     """Parse resume and return structured data"""
     text = extract_text(file_path, file_extension)
@@ -197,7 +214,9 @@ def parse_resume(file_path, file_extension):
         'skills': [{'name': org, 'category': 'technical'} 
                   for org in entities['ORG'] 
                   if not any(keyword in org.lower() for keyword in education_keywords)],
-        'work_experience': work_experiences
+        'work_experience': work_experiences,
+        # For near-duplicate detection across different emails
+        'minhash': minhash_signature(text)
     }
     
     return data
\ No newline at end of file
@@ -0,0 +1,153 @@
+from app.config import Config
+from app.models import db, CacheVersion
+from flask import request, make_response
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from werkzeug.http import is_resource_modified
+from collections import OrderedDict
+from datetime import timezone
+import functools
+import hashlib
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class ResponseCache:
+    """Rendered pages keyed by the versions of the tables they were built from.
+
+    Table versions live in ``cache_versions`` and are mirrored in memory,
+    re-read at most every ``refresh_seconds``, so a cache hit runs no query.
+    This process sees its own writes immediately (the mirror is dropped on
+    commit); writes from other processes show up within ``refresh_seconds``.
+    Pages are evicted least recently used once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, max_bytes, refresh_seconds=2):
+        self.max_bytes = max_bytes
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._modified = {}
+        self._synced_at = None
+        self._pages = OrderedDict()
+        self._bytes = 0
+
+    def _sync(self):
+        rows = db.session.query(CacheVersion.table_name, CacheVersion.version, CacheVersion.updated_at).all()
+        self._versions = {table: version for table, version, _ in rows}
+        self._modified = {table: updated_at for table, _, updated_at in rows if updated_at}
+        self._synced_at = time.monotonic()
+
+    def versions(self, tables):
+        """Current versions of ``tables`` and the time the newest of them changed"""
+        with self._lock:
+            if self._synced_at is None or time.monotonic() - self._synced_at > self.refresh_seconds:
+                self._sync()
+            modified = [self._modified[table] for table in tables if table in self._modified]
+            return (tuple(self._versions.get(table, 0) for table in tables),
+                    max(modified).replace(tzinfo=timezone.utc) if modified else None)
+
+    def invalidate_versions(self):
+        """Re-read the versions on next use"""
+        with self._lock:
+            self._synced_at = None
+
+    def get(self, key):
+        with self._lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+            return page
+
+    def set(self, key, page):
+        size = len(page)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._pages:
+                self._bytes -= len(self._pages.pop(key))
+            self._pages[key] = page
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._pages.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+            self._bytes = 0
+            self._synced_at = None
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """Return the process-wide response cache"""
+    global _cache
+    if _cache is not None:
+        return _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(Config.RESPONSE_CACHE_MAX_BYTES,
+                                   refresh_seconds=Config.RESPONSE_CACHE_REFRESH_SECONDS)
+    return _cache
+
+def bump_versions(*tables):
+    """Invalidate cached pages built from ``tables``, as part of the current transaction"""
+    # Rows are locked in name order so concurrent bumps cannot deadlock
+    stmt = insert(CacheVersion).values([{'table_name': table, 'version': 1} for table in sorted(set(tables))])
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=[CacheVersion.table_name],
+        set_={'version': CacheVersion.version + 1, 'updated_at': db.func.timezone('utc', db.func.now())}
+    ))
+    db.session.info['cache_versions_bumped'] = True
+
+@event.listens_for(Session, 'after_commit')
+def _versions_committed(session):
+    if session.info.pop('cache_versions_bumped', False):
+        get_response_cache().invalidate_versions()
+
+@event.listens_for(Session, 'after_rollback')
+def _versions_rolled_back(session):
+    session.info.pop('cache_versions_bumped', None)
+
+def cached_page(*tables):
+    """Cache a GET view's rendered HTML until one of ``tables`` changes.
+
+    The view must return a rendered ``str`` and depend only on its URL
+    (path arguments and query string) and those tables. The response
+    carries an ETag derived from the table versions and the time of the
+    last change as Last-Modified, so revalidating browsers get a 304
+    without the view or the cache lookup running at all.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(**kwargs):
+            cache = get_response_cache()
+            versions, last_modified = cache.versions(tables)
+            key = (request.endpoint, tuple(sorted(kwargs.items())), request.query_string, versions)
+            etag = hashlib.blake2b(repr(key).encode('utf-8'), digest_size=16).hexdigest()
+
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                response = make_response('', 304)
+            else:
+                page = cache.get(key)
+                if page is None:
+                    page = view(**kwargs)
+                    if not isinstance(page, str):
+                        raise TypeError(f'{request.endpoint} must return a rendered str to be cached, '
+                                        f'not {type(page).__name__}')
+                    cache.set(key, page)
+                response = make_response(page)
+
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            # Browsers must revalidate, which is a 304 unless something changed
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
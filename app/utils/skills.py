@@ -0,0 +1,124 @@
+from sqlalchemy import or_, event
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models import db, SkillDictionary
+import re
+
+# Seed entries for the skill dictionary: (canonical name, category, aliases)
+DEFAULT_SKILLS = [
+    ('Python', 'technical', ['python3', 'py']),
+    ('JavaScript', 'technical', ['js', 'java script', 'ecmascript']),
+    ('TypeScript', 'technical', ['ts']),
+    ('Node.js', 'technical', ['node', 'nodejs', 'node js']),
+    ('React', 'technical', ['reactjs', 'react.js']),
+    ('Amazon Web Services', 'technical', ['aws', 'amazon aws']),
+    ('Google Cloud Platform', 'technical', ['gcp', 'google cloud']),
+    ('Microsoft Azure', 'technical', ['azure', 'ms azure']),
+    ('PostgreSQL', 'technical', ['postgres', 'psql']),
+    ('Kubernetes', 'technical', ['k8s']),
+    ('Machine Learning', 'technical', ['ml']),
+    ('Natural Language Processing', 'technical', ['nlp']),
+    ('scikit-learn', 'technical', ['sklearn', 'scikit learn']),
+    ('Microsoft Excel', 'technical', ['excel', 'ms excel']),
+]
+
+# Normalized name/alias -> (dictionary id, canonical name), shared per process
+_skill_cache = {}
+
+def normalize_skill_name(name):
+    """Lowercase and collapse whitespace/punctuation so variants compare equal"""
+    name = re.sub(r'\s+', ' ', (name or '').lower()).strip()
+    return name.strip(' .,;:-|•')
+
+def _cache_entry(entry):
+    """Add a dictionary row and all of its aliases to the process cache"""
+    value = (entry.id, entry.canonical_name)
+    _skill_cache[entry.normalized_name] = value
+    for alias in entry.aliases or []:
+        _skill_cache[normalize_skill_name(alias)] = value
+    return value
+
+def load_skill_dictionary():
+    """Warm the process cache with every dictionary entry"""
+    _skill_cache.clear()
+    for entry in SkillDictionary.query.all():
+        _cache_entry(entry)
+    return len(_skill_cache)
+
+def seed_skill_dictionary():
+    """Insert the default canonical skills and aliases if missing"""
+    for canonical_name, category, aliases in DEFAULT_SKILLS:
+        stmt = insert(SkillDictionary).values(
+            canonical_name=canonical_name,
+            normalized_name=normalize_skill_name(canonical_name),
+            category=category,
+            aliases=aliases
+        ).on_conflict_do_update(
+            index_elements=['normalized_name'],
+            set_={'aliases': aliases, 'category': category}
+        )
+        db.session.execute(stmt)
+    db.session.commit()
+    return load_skill_dictionary()
+
+def resolve_skill(name, category='technical'):
+    """Return (dictionary id, canonical name) for a raw skill string.
+
+    Unknown skills are added to the dictionary in the caller's transaction,
+    so they disappear again if that transaction rolls back. Their cache
+    entries only become visible to other requests once it commits.
+    """
+    key = normalize_skill_name(name)[:100]
+    if not key:
+        return None
+    if key in _skill_cache:
+        return _skill_cache[key]
+    pending = db.session.info.get('pending_skills', {})
+    if key in pending:
+        return pending[key]
+
+    entry = SkillDictionary.query.filter(
+        or_(SkillDictionary.normalized_name == key, SkillDictionary.aliases.contains([key]))
+    ).first()
+    if entry:
+        return _cache_entry(entry)
+
+    canonical_name = re.sub(r'\s+', ' ', name).strip(' .,;:-|•')[:100]
+    db.session.execute(insert(SkillDictionary).values(
+        canonical_name=canonical_name,
+        normalized_name=key,
+        category=category,
+        aliases=[]
+    ).on_conflict_do_nothing(index_elements=['normalized_name']))
+    row = db.session.execute(
+        db.select(SkillDictionary.id, SkillDictionary.canonical_name)
+        .where(SkillDictionary.normalized_name == key)
+    ).first()
+
+    db.session.info.setdefault('pending_skills', {})[key] = (row.id, row.canonical_name)
+    return row.id, row.canonical_name
+
+@event.listens_for(Session, 'after_commit')
+def _skills_committed(session):
+    _skill_cache.update(session.info.pop('pending_skills', {}))
+
+@event.listens_for(Session, 'after_rollback')
+def _skills_rolled_back(session):
+    session.info.pop('pending_skills', None)
+
+def normalize_skills(skills):
+    """Map parsed skills onto dictionary entries, dropping duplicates"""
+    normalized = []
+    seen = set()
+    for skill_data in skills:
+        resolved = resolve_skill(skill_data.get('name', ''), skill_data.get('category', 'technical'))
+        if not resolved or resolved[0] in seen:
+            continue
+        seen.add(resolved[0])
+        normalized.append({
+            'dictionary_id': resolved[0],
+            'name': resolved[1],
+            'category': skill_data.get('category', 'technical'),
+            'proficiency': skill_data.get('proficiency', 'intermediate')
+        })
+    return normalized
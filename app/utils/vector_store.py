@@ -0,0 +1,155 @@
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from app.config import Config
+from app.models import db
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cached result of the extension check, per process
+_pgvector_available = None
+
+# pgvector rejects larger hnsw.ef_search values
+HNSW_EF_SEARCH_MAX = 1000
+
+def to_vector_literal(embedding):
+    """Format an embedding as a pgvector text literal"""
+    return '[' + ','.join(f'{float(x):.7g}' for x in embedding) + ']'
+
+def pgvector_available(refresh=False):
+    """Check whether the vector extension and embeddings table exist"""
+    global _pgvector_available
+    if _pgvector_available is not None and not refresh:
+        return _pgvector_available
+
+    try:
+        row = db.session.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector') "
+            "AND to_regclass('public.candidate_embeddings') IS NOT NULL"
+        )).scalar()
+        _pgvector_available = bool(row)
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logger.warning(f"pgvector check failed, using in-process scoring: {e}")
+        _pgvector_available = False
+
+    if not _pgvector_available:
+        logger.info("pgvector not available, using in-process scoring")
+    return _pgvector_available
+
+def use_pgvector():
+    """True when pgvector is configured as the shortlist backend and is usable"""
+    return Config.SHORTLIST_BACKEND == 'pgvector' and pgvector_available()
+
+def init_vector_store():
+    """Create the vector extension, embeddings table and ANN index"""
+    global _pgvector_available
+    dim = Config.EMBEDDING_DIMENSION
+    if Config.PGVECTOR_INDEX == 'ivfflat':
+        index_sql = (
+            "CREATE INDEX IF NOT EXISTS ix_candidate_embeddings_embedding "
+            "ON candidate_embeddings USING ivfflat (embedding vector_cosine_ops) "
+            f"WITH (lists = {Config.PGVECTOR_IVFFLAT_LISTS})"
+        )
+    else:
+        index_sql = (
+            "CREATE INDEX IF NOT EXISTS ix_candidate_embeddings_embedding "
+            "ON candidate_embeddings USING hnsw (embedding vector_cosine_ops)"
+        )
+
+    db.session.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+    db.session.execute(text(
+        "CREATE TABLE IF NOT EXISTS candidate_embeddings ("
+        "candidate_id integer PRIMARY KEY REFERENCES candidates (candidate_id) ON DELETE CASCADE, "
+        f"embedding vector({dim}) NOT NULL)"
+    ))
+    db.session.execute(text(index_sql))
+    db.session.commit()
+    _pgvector_available = True
+
+def store_candidate_embedding(candidate_id, embedding):
+    """Insert or replace a candidate's embedding in the current transaction"""
+    db.session.execute(text(
+        "INSERT INTO candidate_embeddings (candidate_id, embedding) "
+        "VALUES (:candidate_id, CAST(:embedding AS vector)) "
+        "ON CONFLICT (candidate_id) DO UPDATE SET embedding = EXCLUDED.embedding"
+    ), {'candidate_id': candidate_id, 'embedding': to_vector_literal(embedding)})
+
+def _filter_clause(min_experience=None, status=None):
+    """Build the structured WHERE clause applied alongside the vector search"""
+    clauses = []
+    params = {}
+    if min_experience is not None:
+        clauses.append("c.years_experience >= :min_experience")
+        params['min_experience'] = min_experience
+    if status:
+        clauses.append("c.status = :status")
+        params['status'] = status
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+def count_indexed_candidates(min_experience=None, status=None):
+    """Count candidates with embeddings that pass the structured filters"""
+    where, params = _filter_clause(min_experience, status)
+    return db.session.execute(text(
+        "SELECT count(*) FROM candidate_embeddings e "
+        f"JOIN candidates c ON c.candidate_id = e.candidate_id{where}"
+    ), params).scalar()
+
+def _search_rows(where, params, exact):
+    """Run the top-k query, through the ANN index or as an exact scan"""
+    if exact:
+        # The materialized CTE keeps the planner off the ANN index: every
+        # distance is computed, so filters and large limits are honoured
+        return db.session.execute(text(
+            "WITH scored AS MATERIALIZED ("
+            "SELECT candidate_id, embedding <=> CAST(:query AS vector) AS distance FROM candidate_embeddings) "
+            "SELECT c.candidate_id, c.full_name, c.years_experience, 1 - e.distance AS score "
+            "FROM scored e "
+            f"JOIN candidates c ON c.candidate_id = e.candidate_id{where} "
+            "ORDER BY e.distance "
+            "LIMIT :limit"
+        ), params).all()
+
+    return db.session.execute(text(
+        "SELECT c.candidate_id, c.full_name, c.years_experience, "
+        "1 - (e.embedding <=> CAST(:query AS vector)) AS score "
+        "FROM candidate_embeddings e "
+        f"JOIN candidates c ON c.candidate_id = e.candidate_id{where} "
+        "ORDER BY e.embedding <=> CAST(:query AS vector) "
+        "LIMIT :limit"
+    ), params).all()
+
+def search_candidates(job_embedding, limit, min_experience=None, status=None):
+    """Return the top ``limit`` candidates by cosine similarity, ranked in Postgres.
+
+    The ANN index returns at most ``hnsw.ef_search`` rows, and fewer when
+    filters discard some of them. Limits above the ef_search cap go straight
+    to an exact scan; an index search that comes back short is retried as one.
+    ``limit`` must not exceed the filtered pool (see count_indexed_candidates).
+    """
+    where, params = _filter_clause(min_experience, status)
+    params.update({'query': to_vector_literal(job_embedding), 'limit': limit})
+
+    exact = False
+    if Config.PGVECTOR_INDEX == 'ivfflat':
+        db.session.execute(text(f"SET LOCAL ivfflat.probes = {Config.PGVECTOR_IVFFLAT_PROBES}"))
+    elif limit > HNSW_EF_SEARCH_MAX:
+        exact = True
+    else:
+        ef_search = max(Config.PGVECTOR_HNSW_EF_SEARCH, limit)
+        db.session.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+
+    rows = _search_rows(where, params, exact)
+    if not exact and len(rows) < limit:
+        logger.info(f"Index search returned {len(rows)} of {limit} candidates, falling back to an exact scan")
+        rows = _search_rows(where, params, exact=True)
+
+    return [{
+        'candidate_id': row.candidate_id,
+        'similarity_score': float(row.score),
+        'data': {
+            'candidate_id': row.candidate_id,
+            'full_name': row.full_name,
+            'years_experience': row.years_experience
+        }
+    } for row in rows]
@@ -0,0 +1,85 @@
+"""Startup time, memory and batch latency of each encoder backend.
+
+    python benchmarks/encoder_backends.py --backends torch torch-int8 onnx onnx-int8
+
+Each backend is measured in a fresh subprocess so startup time and resident
+memory are not skewed by models loaded earlier. The corpus is the text of
+the resumes in test_resumes, split into lines.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+def load_corpus(directory):
+    from app.utils.parser import extract_text
+    texts = []
+    for filename in sorted(os.listdir(directory)):
+        file_ext = os.path.splitext(filename)[1][1:].lower()
+        text = extract_text(os.path.join(directory, filename), file_ext)
+        texts.extend(line.strip() for line in text.split('\n') if len(line.strip()) > 20)
+    return texts
+
+def measure(backend, args):
+    """Run inside the child process and print one JSON result line"""
+    import numpy as np
+    from app.config import Config
+    from app.utils.encoder_backends import load_backend
+
+    texts = load_corpus(args.corpus)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    encoder = load_backend(Config.ENCODER_MODEL_NAME, backend, num_threads=args.threads)
+    startup = time.perf_counter() - start
+
+    batches = [texts[i:i + args.batch_size] for i in range(0, len(texts), args.batch_size)]
+    encoder.encode(batches[0], batch_size=args.batch_size)  # warm up
+    latencies = []
+    for _ in range(args.repeat):
+        for batch in batches:
+            start = time.perf_counter()
+            encoder.encode(batch, batch_size=args.batch_size)
+            latencies.append(time.perf_counter() - start)
+
+    print(json.dumps({
+        'backend': encoder.name,
+        'startup_s': startup,
+        'rss_mb': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024,
+        'p50_ms': float(np.percentile(latencies, 50)) * 1000,
+        'p95_ms': float(np.percentile(latencies, 95)) * 1000,
+        'texts': len(texts)
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backends', nargs='+', default=['torch', 'torch-int8', 'onnx', 'onnx-int8'])
+    parser.add_argument('--corpus', default=os.path.join(ROOT, 'test_resumes'))
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure(args.child, args)
+        return
+
+    print(f"{'backend':<12} {'startup':>9} {'memory':>9} {'p50/batch':>10} {'p95/batch':>10}")
+    for backend in args.backends:
+        command = [sys.executable, __file__, '--child', backend, '--corpus', args.corpus,
+                   '--batch-size', str(args.batch_size), '--threads', str(args.threads),
+                   '--repeat', str(args.repeat)]
+        output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{result['backend']:<12} {result['startup_s']:>8.2f}s {result['rss_mb']:>7.0f}MB "
+              f"{result['p50_ms']:>8.1f}ms {result['p95_ms']:>8.1f}ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Encoder service throughput under many concurrent callers.
+
+    python benchmarks/encoder_throughput.py --workers 0 2 4 --callers 32 --requests 2000
+
+Each caller thread sends single-profile encode requests, as web threads do
+during uploads; the service coalesces them into micro-batches.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.config import Config
+from app.utils.encoder import EncoderService
+
+SAMPLE_TEXTS = [
+    "Candidate Profile: Python developer, Flask, AWS, PostgreSQL, 5 years",
+    "Candidate Profile: Data scientist, PyTorch, scikit-learn, NLP, 3 years",
+    "Candidate Profile: Security analyst, SIEM, penetration testing, 7 years",
+    "Candidate Profile: Frontend engineer, React, TypeScript, 2 years",
+]
+
+def run(workers, args):
+    service = EncoderService(
+        Config.ENCODER_MODEL_NAME,
+        num_workers=workers,
+        threads_per_worker=args.threads_per_worker,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms
+    )
+    try:
+        service.encode(SAMPLE_TEXTS)  # warm up model(s)
+        texts = [SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)] + f" #{i}" for i in range(args.requests)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.callers) as pool:
+            list(pool.map(lambda text: service.encode([text]), texts))
+        elapsed = time.perf_counter() - start
+        metrics = service.metrics()
+    finally:
+        service.shutdown()
+
+    print(f"workers={workers}: {args.requests / elapsed:.1f} texts/s, "
+          f"avg batch {metrics['avg_batch_size']:.1f}, "
+          f"avg batch latency {metrics['avg_batch_latency_ms']:.1f}ms")
+    if args.verbose:
+        print(json.dumps(metrics, indent=2))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 2])
+    parser.add_argument('--threads-per-worker', type=int, default=1)
+    parser.add_argument('--callers', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--max-batch-size', type=int, default=Config.ENCODER_MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=float, default=Config.ENCODER_MAX_WAIT_MS)
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        run(workers, args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Memory and ranking time of the columnar feature store vs. per-candidate dicts.
+
+    python benchmarks/feature_store_memory.py --candidates 100000 --dimension 384
+
+Builds synthetic candidates both as the list of dicts the shortlister used to
+load (with an embedding array each) and as a CandidateFeatureStore, then
+reports traced allocations and the time to rank one job description.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.utils.feature_store import CandidateFeatureStore
+from app.utils.shortlister import _normalize_rows
+
+def synthetic(count, dimension, rng):
+    years = rng.integers(0, 30, size=count)
+    skill_lists = [rng.integers(1, 5000, size=rng.integers(3, 15)).tolist() for _ in range(count)]
+    embeddings = rng.normal(size=(count, dimension)).astype(np.float32)
+    return years, skill_lists, embeddings
+
+def score_dicts(job, candidates):
+    """Rank the way the shortlister did before the store: stack, normalize, multiply"""
+    embeddings = _normalize_rows(np.stack([c['embedding'] for c in candidates]))
+    return (_normalize_rows(job) @ embeddings.T)[0]
+
+def build_dicts(years, skill_lists, embeddings):
+    return [{
+        'candidate_id': i + 1,
+        'full_name': f'Candidate {i + 1}',
+        'years_experience': int(years[i]),
+        'status': 'pending',
+        'skills': [{'dictionary_id': skill_id} for skill_id in skill_lists[i]],
+        'embedding': embeddings[i].copy()
+    } for i in range(len(years))]
+
+def build_store(years, skill_lists, embeddings):
+    store = CandidateFeatureStore(embeddings.shape[1])
+    count = len(years)
+    store.upsert_many(list(range(1, count + 1)), years.tolist(), ['pending'] * count,
+                      skill_lists, embeddings, np.arange(count))
+    return store
+
+def traced(build, *args):
+    tracemalloc.start()
+    result = build(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--dimension', type=int, default=384)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    years, skill_lists, embeddings = synthetic(args.candidates, args.dimension, rng)
+    job = rng.normal(size=(1, args.dimension)).astype(np.float32)
+    per_100k = 100000 / args.candidates
+
+    candidates, dict_bytes = traced(build_dicts, years, skill_lists, embeddings)
+    start = time.perf_counter()
+    scores = score_dicts(job, candidates)
+    np.argsort(-scores)[:max(1, args.candidates // 10)]
+    dict_seconds = time.perf_counter() - start
+    del candidates
+
+    store, store_bytes = traced(build_store, years, skill_lists, embeddings)
+    start = time.perf_counter()
+    store.top_candidates(job, top_percent=10)
+    store_seconds = time.perf_counter() - start
+
+    print(f"list of dicts:  {dict_bytes * per_100k / 1e6:8.1f} MB per 100k candidates, "
+          f"rank {dict_seconds * 1000:.0f}ms")
+    print(f"feature store:  {store_bytes * per_100k / 1e6:8.1f} MB per 100k candidates "
+          f"({store.nbytes() * per_100k / 1e6:.1f} MB live columns), rank {store_seconds * 1000:.0f}ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Concurrent upload load test.
+
+Start the server twice, once with CPU_WORKERS=0 (parsing in the request
+thread) and once with CPU_WORKERS set to the number of cores, then compare:
+
+    gunicorn -k gthread --workers 2 --threads 16 run:app
+    python benchmarks/upload_load.py --url http://localhost:8000 --requests 200 --concurrency 32
+
+While uploads are in flight the script also probes GET /candidates, so the
+report shows both upload throughput and how responsive the other routes stay.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+import argparse
+import os
+import threading
+import time
+import requests
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+def upload(url, path):
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        response = requests.post(f"{url}/upload", files={'resume': (os.path.basename(path), f)})
+    return response.status_code, time.perf_counter() - start
+
+def probe(url, stop, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        requests.get(f"{url}/candidates")
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.1)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--files', default='test_resumes')
+    parser.add_argument('--requests', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=16)
+    args = parser.parse_args()
+
+    files = [os.path.join(args.files, name) for name in sorted(os.listdir(args.files))]
+    paths = [files[i % len(files)] for i in range(args.requests)]
+
+    stop = threading.Event()
+    probe_latencies = []
+    prober = threading.Thread(target=probe, args=(args.url, stop, probe_latencies), daemon=True)
+    prober.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda path: upload(args.url, path), paths))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    prober.join()
+
+    latencies = [latency for _, latency in results]
+    print(f"Uploads:        {len(results)} in {elapsed:.1f}s ({len(results) / elapsed:.2f} req/s)")
+    print(f"Status codes:   {dict(Counter(status for status, _ in results))}")
+    print(f"Upload latency: p50 {percentile(latencies, 50):.2f}s  p95 {percentile(latencies, 95):.2f}s")
+    print(f"Probe latency:  p50 {percentile(probe_latencies, 50) * 1000:.0f}ms  "
+          f"p95 {percentile(probe_latencies, 95) * 1000:.0f}ms ({len(probe_latencies)} probes)")
+
+if __name__ == '__main__':
+    main()
@@ -12,10 +12,16 @@ CREATE TABLE IF NOT EXISTS public.candidates
     years_experience integer,
     resume_file_path character varying(255) COLLATE pg_catalog."default",
     status character varying(20) COLLATE pg_catalog."default" DEFAULT 'pending'::character varying,
+    profile_text text COLLATE pg_catalog."default",
+    duplicate_of_id integer,
+    duplicate_score double precision,
     created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
     updated_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT candidates_pkey PRIMARY KEY (candidate_id),
-    CONSTRAINT candidates_email_key UNIQUE (email)
+    CONSTRAINT candidates_duplicate_of_id_fkey FOREIGN KEY (duplicate_of_id)
+        REFERENCES public.candidates (candidate_id) MATCH SIMPLE
+        ON UPDATE NO ACTION
+        ON DELETE SET NULL
 )
 
 TABLESPACE pg_default;
@@ -96,6 +102,31 @@ ALTER TABLE IF EXISTS public.shortlists
 
 
 
+-- Table: public.skill_dictionary
+
+-- DROP TABLE IF EXISTS public.skill_dictionary;
+
+CREATE TABLE IF NOT EXISTS public.skill_dictionary
+(
+    id integer NOT NULL GENERATED BY DEFAULT AS IDENTITY,
+    canonical_name character varying(100) COLLATE pg_catalog."default" NOT NULL,
+    normalized_name character varying(100) COLLATE pg_catalog."default" NOT NULL,
+    category character varying(20) COLLATE pg_catalog."default" DEFAULT 'technical'::character varying,
+    aliases character varying(100)[] DEFAULT '{}'::character varying[],
+    CONSTRAINT skill_dictionary_pkey PRIMARY KEY (id),
+    CONSTRAINT skill_dictionary_normalized_name_key UNIQUE (normalized_name)
+)
+
+TABLESPACE pg_default;
+
+ALTER TABLE IF EXISTS public.skill_dictionary
+    OWNER to postgres;
+
+-- Alias lookups (aliases @> ARRAY[...]) when resolving skills
+CREATE INDEX IF NOT EXISTS ix_skill_dictionary_aliases
+    ON public.skill_dictionary USING gin (aliases);
+
+
 -- Table: public.skills
 
 -- DROP TABLE IF EXISTS public.skills;
@@ -105,12 +136,17 @@ CREATE TABLE IF NOT EXISTS public.skills
     skill_id integer NOT NULL DEFAULT nextval('skills_skill_id_seq'::regclass),
     candidate_id integer,
     skill_name character varying(100) COLLATE pg_catalog."default",
+    dictionary_id integer,
     skill_category character varying(20) COLLATE pg_catalog."default",
     proficiency_level character varying(20) COLLATE pg_catalog."default",
     CONSTRAINT skills_pkey PRIMARY KEY (skill_id),
     CONSTRAINT skills_candidate_id_fkey FOREIGN KEY (candidate_id)
         REFERENCES public.candidates (candidate_id) MATCH SIMPLE
         ON UPDATE NO ACTION
+        ON DELETE NO ACTION,
+    CONSTRAINT skills_dictionary_id_fkey FOREIGN KEY (dictionary_id)
+        REFERENCES public.skill_dictionary (id) MATCH SIMPLE
+        ON UPDATE NO ACTION
         ON DELETE NO ACTION
 )
 
@@ -118,6 +154,97 @@ TABLESPACE pg_default;
 
 ALTER TABLE IF EXISTS public.skills
     OWNER to postgres;
+
+-- Table: public.candidate_signatures
+
+-- DROP TABLE IF EXISTS public.candidate_signatures;
+
+CREATE TABLE IF NOT EXISTS public.candidate_signatures
+(
+    candidate_id integer NOT NULL,
+    signature bytea NOT NULL,
+    CONSTRAINT candidate_signatures_pkey PRIMARY KEY (candidate_id),
+    CONSTRAINT candidate_signatures_candidate_id_fkey FOREIGN KEY (candidate_id)
+        REFERENCES public.candidates (candidate_id) MATCH SIMPLE
+        ON UPDATE NO ACTION
+        ON DELETE CASCADE
+)
+
+TABLESPACE pg_default;
+
+ALTER TABLE IF EXISTS public.candidate_signatures
+    OWNER to postgres;
+
+
+-- Table: public.candidate_lsh_buckets
+
+-- DROP TABLE IF EXISTS public.candidate_lsh_buckets;
+
+CREATE TABLE IF NOT EXISTS public.candidate_lsh_buckets
+(
+    band smallint NOT NULL,
+    bucket bigint NOT NULL,
+    candidate_id integer NOT NULL,
+    CONSTRAINT candidate_lsh_buckets_pkey PRIMARY KEY (band, bucket, candidate_id),
+    CONSTRAINT candidate_lsh_buckets_candidate_id_fkey FOREIGN KEY (candidate_id)
+        REFERENCES public.candidates (candidate_id) MATCH SIMPLE
+        ON UPDATE NO ACTION
+        ON DELETE CASCADE
+)
+
+TABLESPACE pg_default;
+
+ALTER TABLE IF EXISTS public.candidate_lsh_buckets
+    OWNER to postgres;
+
+CREATE INDEX IF NOT EXISTS ix_candidate_lsh_buckets_candidate_id
+    ON public.candidate_lsh_buckets USING btree (candidate_id);
+
+
+-- Table: public.upload_sessions
+
+-- DROP TABLE IF EXISTS public.upload_sessions;
+
+CREATE TABLE IF NOT EXISTS public.upload_sessions
+(
+    id character varying(36) COLLATE pg_catalog."default" NOT NULL,
+    s3_upload_id character varying(1024) COLLATE pg_catalog."default" NOT NULL,
+    file_key character varying(255) COLLATE pg_catalog."default" NOT NULL,
+    filename character varying(255) COLLATE pg_catalog."default" NOT NULL,
+    file_extension character varying(10) COLLATE pg_catalog."default" NOT NULL,
+    total_size bigint NOT NULL,
+    part_size integer NOT NULL,
+    status character varying(20) COLLATE pg_catalog."default" NOT NULL DEFAULT 'uploading'::character varying,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT upload_sessions_pkey PRIMARY KEY (id)
+)
+
+TABLESPACE pg_default;
+
+ALTER TABLE IF EXISTS public.upload_sessions
+    OWNER to postgres;
+
+CREATE INDEX IF NOT EXISTS ix_upload_sessions_created_at
+    ON public.upload_sessions USING btree (created_at);
+
+-- Table: public.cache_versions
+
+-- DROP TABLE IF EXISTS public.cache_versions;
+
+CREATE TABLE IF NOT EXISTS public.cache_versions
+(
+    table_name character varying(50) COLLATE pg_catalog."default" NOT NULL,
+    version bigint NOT NULL DEFAULT 0,
+    updated_at timestamp without time zone DEFAULT timezone('utc', now()),
+    CONSTRAINT cache_versions_pkey PRIMARY KEY (table_name)
+)
+
+TABLESPACE pg_default;
+
+ALTER TABLE IF EXISTS public.cache_versions
+    OWNER to postgres;
+
+
 -- Table: public.candidates
 
 -- DROP TABLE IF EXISTS public.candidates;
@@ -132,10 +259,16 @@ CREATE TABLE IF NOT EXISTS public.candidates
     years_experience integer,
     resume_file_path character varying(255) COLLATE pg_catalog."default",
     status character varying(20) COLLATE pg_catalog."default" DEFAULT 'pending'::character varying,
+    profile_text text COLLATE pg_catalog."default",
+    duplicate_of_id integer,
+    duplicate_score double precision,
     created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
     updated_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT candidates_pkey PRIMARY KEY (candidate_id),
-    CONSTRAINT candidates_email_key UNIQUE (email)
+    CONSTRAINT candidates_duplicate_of_id_fkey FOREIGN KEY (duplicate_of_id)
+        REFERENCES public.candidates (candidate_id) MATCH SIMPLE
+        ON UPDATE NO ACTION
+        ON DELETE SET NULL
 )
 
 TABLESPACE pg_default;
@@ -216,6 +349,31 @@ ALTER TABLE IF EXISTS public.shortlists
 
 
 
+-- Table: public.skill_dictionary
+
+-- DROP TABLE IF EXISTS public.skill_dictionary;
+
+CREATE TABLE IF NOT EXISTS public.skill_dictionary
+(
+    id integer NOT NULL GENERATED BY DEFAULT AS IDENTITY,
+    canonical_name character varying(100) COLLATE pg_catalog."default" NOT NULL,
+    normalized_name character varying(100) COLLATE pg_catalog."default" NOT NULL,
+    category character varying(20) COLLATE pg_catalog."default" DEFAULT 'technical'::character varying,
+    aliases character varying(100)[] DEFAULT '{}'::character varying[],
+    CONSTRAINT skill_dictionary_pkey PRIMARY KEY (id),
+    CONSTRAINT skill_dictionary_normalized_name_key UNIQUE (normalized_name)
+)
+
+TABLESPACE pg_default;
+
+ALTER TABLE IF EXISTS public.skill_dictionary
+    OWNER to postgres;
+
+-- Alias lookups (aliases @> ARRAY[...]) when resolving skills
+CREATE INDEX IF NOT EXISTS ix_skill_dictionary_aliases
+    ON public.skill_dictionary USING gin (aliases);
+
+
 -- Table: public.skills
 
 -- DROP TABLE IF EXISTS public.skills;
@@ -225,16 +383,146 @@ CREATE TABLE IF NOT EXISTS public.skills
     skill_id integer NOT NULL DEFAULT nextval('skills_skill_id_seq'::regclass),
     candidate_id integer,
     skill_name character varying(100) COLLATE pg_catalog."default",
+    dictionary_id integer,
     skill_category character varying(20) COLLATE pg_catalog."default",
     proficiency_level character varying(20) COLLATE pg_catalog."default",
     CONSTRAINT skills_pkey PRIMARY KEY (skill_id),
     CONSTRAINT skills_candidate_id_fkey FOREIGN KEY (candidate_id)
         REFERENCES public.candidates (candidate_id) MATCH SIMPLE
         ON UPDATE NO ACTION
+        ON DELETE NO ACTION,
+    CONSTRAINT skills_dictionary_id_fkey FOREIGN KEY (dictionary_id)
+        REFERENCES public.skill_dictionary (id) MATCH SIMPLE
+        ON UPDATE NO ACTION
         ON DELETE NO ACTION
 )
 
 TABLESPACE pg_default;
 
 ALTER TABLE IF EXISTS public.skills
-    OWNER to postgres;
\ No newline at end of file
+    OWNER to postgres;
+
+-- Table: public.candidate_signatures
+
+-- DROP TABLE IF EXISTS public.candidate_signatures;
+
+CREATE TABLE IF NOT EXISTS public.candidate_signatures
+(
+    candidate_id integer NOT NULL,
+    signature bytea NOT NULL,
+    CONSTRAINT candidate_signatures_pkey PRIMARY KEY (candidate_id),
+    CONSTRAINT candidate_signatures_candidate_id_fkey FOREIGN KEY (candidate_id)
+        REFERENCES public.candidates (candidate_id) MATCH SIMPLE
+        ON UPDATE NO ACTION
+        ON DELETE CASCADE
+)
+
+TABLESPACE pg_default;
+
+ALTER TABLE IF EXISTS public.candidate_signatures
+    OWNER to postgres;
+
+
+-- Table: public.candidate_lsh_buckets
+
+-- DROP TABLE IF EXISTS public.candidate_lsh_buckets;
+
+CREATE TABLE IF NOT EXISTS public.candidate_lsh_buckets
+(
+    band smallint NOT NULL,
+    bucket bigint NOT NULL,
+    candidate_id integer NOT NULL,
+    CONSTRAINT candidate_lsh_buckets_pkey PRIMARY KEY (band, bucket, candidate_id),
+    CONSTRAINT candidate_lsh_buckets_candidate_id_fkey FOREIGN KEY (candidate_id)
+        REFERENCES public.candidates (candidate_id) MATCH SIMPLE
+        ON UPDATE NO ACTION
+        ON DELETE CASCADE
+)
+
+TABLESPACE pg_default;
+
+ALTER TABLE IF EXISTS public.candidate_lsh_buckets
+    OWNER to postgres;
+
+CREATE INDEX IF NOT EXISTS ix_candidate_lsh_buckets_candidate_id
+    ON public.candidate_lsh_buckets USING btree (candidate_id);
+
+
+-- Table: public.upload_sessions
+
+-- DROP TABLE IF EXISTS public.upload_sessions;
+
+CREATE TABLE IF NOT EXISTS public.upload_sessions
+(
+    id character varying(36) COLLATE pg_catalog."default" NOT NULL,
+    s3_upload_id character varying(1024) COLLATE pg_catalog."default" NOT NULL,
+    file_key character varying(255) COLLATE pg_catalog."default" NOT NULL,
+    filename character varying(255) COLLATE pg_catalog."default" NOT NULL,
+    file_extension character varying(10) COLLATE pg_catalog."default" NOT NULL,
+    total_size bigint NOT NULL,
+    part_size integer NOT NULL,
+    status character varying(20) COLLATE pg_catalog."default" NOT NULL DEFAULT 'uploading'::character varying,
+    created_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT upload_sessions_pkey PRIMARY KEY (id)
+)
+
+TABLESPACE pg_default;
+
+ALTER TABLE IF EXISTS public.upload_sessions
+    OWNER to postgres;
+
+CREATE INDEX IF NOT EXISTS ix_upload_sessions_created_at
+    ON public.upload_sessions USING btree (created_at);
+
+-- Table: public.cache_versions
+
+-- DROP TABLE IF EXISTS public.cache_versions;
+
+CREATE TABLE IF NOT EXISTS public.cache_versions
+(
+    table_name character varying(50) COLLATE pg_catalog."default" NOT NULL,
+    version bigint NOT NULL DEFAULT 0,
+    updated_at timestamp without time zone DEFAULT timezone('utc', now()),
+    CONSTRAINT cache_versions_pkey PRIMARY KEY (table_name)
+)
+
+TABLESPACE pg_default;
+
+ALTER TABLE IF EXISTS public.cache_versions
+    OWNER to postgres;
+
+
+-- Upgrades for databases created before the columns above existed
+
+ALTER TABLE IF EXISTS public.candidates
+    ADD COLUMN IF NOT EXISTS profile_text text;
+
+ALTER TABLE IF EXISTS public.candidates
+    ADD COLUMN IF NOT EXISTS duplicate_of_id integer REFERENCES public.candidates (candidate_id) ON DELETE SET NULL,
+    ADD COLUMN IF NOT EXISTS duplicate_score double precision;
+
+ALTER TABLE IF EXISTS public.skills
+    ADD COLUMN IF NOT EXISTS dictionary_id integer REFERENCES public.skill_dictionary (id);
+
+ALTER TABLE IF EXISTS public.upload_sessions
+    ADD COLUMN IF NOT EXISTS status character varying(20) NOT NULL DEFAULT 'uploading'::character varying;
+
+CREATE INDEX IF NOT EXISTS ix_skills_dictionary_id
+    ON public.skills USING btree (dictionary_id);
+
+CREATE INDEX IF NOT EXISTS ix_skill_dictionary_aliases
+    ON public.skill_dictionary USING gin (aliases);
+
+-- Case-insensitive email uniqueness; also the ON CONFLICT target for uploads
+CREATE UNIQUE INDEX IF NOT EXISTS candidates_email_lower_key
+    ON public.candidates USING btree (lower(email::text));
+
+-- The case-insensitive index above is the only email uniqueness rule. A second,
+-- case-sensitive one would still raise on concurrent ON CONFLICT inserts.
+ALTER TABLE IF EXISTS public.candidates
+    DROP CONSTRAINT IF EXISTS candidates_email_key;
+
+DROP INDEX IF EXISTS public.ix_candidates_email;
+
+CREATE INDEX IF NOT EXISTS ix_candidates_duplicate_of_id
+    ON public.candidates USING btree (duplicate_of_id);
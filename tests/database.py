@@ -0,0 +1,22 @@
+import os
+import unittest
+from unittest import mock
+from app.config import Config
+
+# Point at a disposable Postgres with the vector extension, e.g.
+# docker run -e POSTGRES_PASSWORD=postgres -p 5433:5432 pgvector/pgvector:pg16
+TEST_DATABASE_URL = os.getenv('TEST_DATABASE_URL')
+
+@unittest.skipUnless(TEST_DATABASE_URL, 'TEST_DATABASE_URL not set')
+class DatabaseTestCase(unittest.TestCase):
+    """Base for tests that run the app against TEST_DATABASE_URL (skipped when unset)"""
+
+    @classmethod
+    def setUpClass(cls):
+        from app import create_app
+        from app.models import db
+        super().setUpClass()
+        with mock.patch.object(Config, 'SQLALCHEMY_DATABASE_URI', TEST_DATABASE_URL):
+            cls.app = create_app()
+        with cls.app.app_context():
+            db.create_all()
@@ -0,0 +1,240 @@
+import io
+import os
+import unittest
+from datetime import timedelta
+from unittest import mock
+import boto3
+from botocore.stub import Stubber
+from app.config import Config
+from app.models import UploadSession
+from app.utils import file_processor
+from database import DatabaseTestCase
+
+MiB = 1024 * 1024
+
+class FakeS3:
+    """In-memory stand-in for the multipart calls the upload routes make"""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = f'upload-{len(self.uploads) + 1}'
+        self.uploads[upload_id] = {}
+        return {'UploadId': upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body, ContentLength):
+        data = Body.read()
+        assert len(data) == ContentLength
+        self.uploads[UploadId][PartNumber] = data
+        return {'ETag': f'"etag-{PartNumber}"'}
+
+    def list_parts(self, Bucket, Key, UploadId, PartNumberMarker=0):
+        return {'Parts': [
+            {'PartNumber': number, 'ETag': f'"etag-{number}"', 'Size': len(data)}
+            for number, data in sorted(self.uploads[UploadId].items())
+        ], 'IsTruncated': False}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        parts = self.uploads.pop(UploadId)
+        self.objects[Key] = b''.join(parts[p['PartNumber']] for p in MultipartUpload['Parts'])
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+
+    def download_file(self, Bucket, Key, Filename):
+        with open(Filename, 'wb') as f:
+            f.write(self.objects[Key])
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+class TestSpoolStream(unittest.TestCase):
+    def test_copies_exact_size(self):
+        """Only the declared number of bytes is read from the stream"""
+        with file_processor.spool_stream(io.BytesIO(b'abcdefgh'), 5) as spool:
+            self.assertEqual(spool.read(), b'abcde')
+
+    def test_short_body_is_rejected(self):
+        """A body shorter than Content-Length is an error, not a short part"""
+        with self.assertRaises(ValueError):
+            file_processor.spool_stream(io.BytesIO(b'abc'), 10)
+
+    def test_large_parts_spill_to_disk(self):
+        """Memory use stays bounded by UPLOAD_SPOOL_MAX_MEMORY"""
+        with mock.patch.object(Config, 'UPLOAD_SPOOL_MAX_MEMORY', 1024):
+            small = file_processor.spool_stream(io.BytesIO(b'x' * 512), 512)
+            large = file_processor.spool_stream(io.BytesIO(b'x' * 4096), 4096)
+        self.assertFalse(small._rolled)
+        self.assertTrue(large._rolled)
+        self.assertEqual(len(large.read()), 4096)
+        small.close()
+        large.close()
+
+class TestUploadSessionParts(unittest.TestCase):
+    def test_part_layout(self):
+        """Every part is full size except a shorter last part"""
+        upload_session = UploadSession(total_size=12 * MiB + 7, part_size=5 * MiB)
+        self.assertEqual(upload_session.total_parts, 3)
+        self.assertEqual(upload_session.expected_part_size(1), 5 * MiB)
+        self.assertEqual(upload_session.expected_part_size(3), 2 * MiB + 7)
+
+    def test_single_part(self):
+        upload_session = UploadSession(total_size=100, part_size=5 * MiB)
+        self.assertEqual(upload_session.total_parts, 1)
+        self.assertEqual(upload_session.expected_part_size(1), 100)
+
+class TestListUploadedParts(unittest.TestCase):
+    def test_follows_pagination(self):
+        """ListParts pages are merged so resume sees every stored part"""
+        client = boto3.client('s3', region_name='us-east-1',
+                              aws_access_key_id='test', aws_secret_access_key='test')
+        stubber = Stubber(client)
+        params = {'Bucket': 'bucket', 'Key': 'resumes/a.pdf', 'UploadId': 'u1'}
+        stubber.add_response('list_parts', {
+            'Parts': [{'PartNumber': 1, 'ETag': '"a"', 'Size': 5}],
+            'IsTruncated': True, 'NextPartNumberMarker': 1
+        }, {**params, 'PartNumberMarker': 0})
+        stubber.add_response('list_parts', {
+            'Parts': [{'PartNumber': 3, 'ETag': '"c"', 'Size': 2}],
+            'IsTruncated': False
+        }, {**params, 'PartNumberMarker': 1})
+
+        with stubber, mock.patch.object(file_processor, '_s3_client', client), \
+                mock.patch.object(Config, 'S3_BUCKET_NAME', 'bucket'):
+            parts = file_processor.list_uploaded_parts('resumes/a.pdf', 'u1')
+
+        self.assertEqual(parts, {1: {'etag': '"a"', 'size': 5}, 3: {'etag': '"c"', 'size': 2}})
+
+class TestUploadLimitsConfig(unittest.TestCase):
+    def test_part_size_must_fit_request_limit(self):
+        from app import create_app
+        with mock.patch.object(Config, 'UPLOAD_PART_SIZE', 8 * MiB), \
+                mock.patch.object(Config, 'MAX_CONTENT_LENGTH', 5 * MiB):
+            with self.assertRaises(ValueError):
+                create_app()
+
+    def test_upload_page_shows_configured_maximum(self):
+        from app import create_app
+        with mock.patch.object(Config, 'UPLOAD_MAX_FILE_SIZE', 250 * MiB):
+            page = create_app().test_client().get('/')
+        self.assertIn(b'Max 250MB', page.data)
+
+class TestChunkedUploadRoutes(DatabaseTestCase):
+    def setUp(self):
+        self.s3 = FakeS3()
+        self.client = self.app.test_client()
+        parsed = {
+            'full_name': 'Chunked Upload', 'email': 'chunked-upload@example.com',
+            'phone': None, 'location': None, 'years_experience': 3,
+            'education': [], 'skills': []
+        }
+        patches = [
+            mock.patch.object(file_processor, '_s3_client', self.s3),
+            mock.patch.object(Config, 'CPU_WORKERS', 0),
+            mock.patch('app.routes.parse_resume', return_value=parsed),
+            mock.patch('app.routes.use_pgvector', return_value=False),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        from app.models import db, Candidate
+        with self.app.app_context():
+            Candidate.query.filter_by(email='chunked-upload@example.com').delete()
+            UploadSession.query.delete()
+            db.session.commit()
+
+    def _put_part(self, upload_id, number, data):
+        return self.client.put(f'/uploads/{upload_id}/parts/{number}', data=data,
+                               headers={'Content-Type': 'application/octet-stream'})
+
+    def test_interrupted_upload_resumes(self):
+        """Missing parts are reported, re-sent, and the file is assembled in order"""
+        content = os.urandom(11 * MiB)
+        response = self.client.post('/uploads', json={'filename': 'big resume.pdf', 'size': len(content)})
+        self.assertEqual(response.status_code, 201)
+        upload = response.get_json()
+        self.assertEqual(upload['total_parts'], 3)
+
+        part_size = upload['part_size']
+        chunks = [content[i:i + part_size] for i in range(0, len(content), part_size)]
+        self.assertEqual(self._put_part(upload['upload_id'], 1, chunks[0]).status_code, 200)
+        self.assertEqual(self._put_part(upload['upload_id'], 3, chunks[2]).status_code, 200)
+
+        # Connection dropped during part 2: the client asks what is left
+        status = self.client.get(f"/uploads/{upload['upload_id']}").get_json()
+        self.assertEqual(status['missing_parts'], [2])
+        self.assertEqual(self.client.post(f"/uploads/{upload['upload_id']}/complete").status_code, 400)
+
+        self.assertEqual(self._put_part(upload['upload_id'], 2, chunks[1]).status_code, 200)
+        response = self.client.post(f"/uploads/{upload['upload_id']}/complete")
+        self.assertEqual(response.status_code, 201, response.get_json())
+        self.assertEqual(response.get_json()['email'], 'chunked-upload@example.com')
+        self.assertEqual(list(self.s3.objects.values()), [content])
+
+        # The session is consumed by completion
+        self.assertEqual(self.client.post(f"/uploads/{upload['upload_id']}/complete").status_code, 404)
+
+    def test_session_outlives_a_failed_completion(self):
+        """The session row is kept (marked completing) until S3 assembles the file"""
+        from app.models import db
+        upload = self.client.post('/uploads', json={'filename': 'a.pdf', 'size': 10}).get_json()
+        self.assertEqual(self._put_part(upload['upload_id'], 1, b'0123456789').status_code, 200)
+
+        seen = []
+        def failing_complete(**kwargs):
+            seen.append(db.session.get(UploadSession, upload['upload_id']).status)
+            raise RuntimeError('S3 unavailable')
+
+        with mock.patch.object(self.s3, 'complete_multipart_upload', side_effect=failing_complete):
+            response = self.client.post(f"/uploads/{upload['upload_id']}/complete")
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(seen, ['completing'])
+        with self.app.app_context():
+            self.assertEqual(db.session.get(UploadSession, upload['upload_id']).status, 'uploading')
+
+        # While another request is completing, parts and a second completion are refused
+        with self.app.app_context():
+            UploadSession.query.filter_by(id=upload['upload_id']).update({'status': 'completing'})
+            db.session.commit()
+        self.assertEqual(self._put_part(upload['upload_id'], 1, b'0123456789').status_code, 409)
+        self.assertEqual(self.client.post(f"/uploads/{upload['upload_id']}/complete").status_code, 409)
+
+    def test_stale_completing_session_is_cleaned_up(self):
+        """abort-stale-uploads also removes a file assembled by a completion that never finished"""
+        from app.models import db
+        upload = self.client.post('/uploads', json={'filename': 'a.pdf', 'size': 10}).get_json()
+        with self.app.app_context():
+            upload_session = db.session.get(UploadSession, upload['upload_id'])
+            upload_session.status = 'completing'
+            upload_session.created_at = db.func.current_timestamp() - timedelta(days=2)
+            self.s3.objects[upload_session.file_key] = b'0123456789'
+            db.session.commit()
+
+        with mock.patch.object(Config, 'S3_BUCKET_NAME', 'bucket'):
+            result = self.app.test_cli_runner().invoke(args=['abort-stale-uploads'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertEqual(self.s3.objects, {})
+        with self.app.app_context():
+            self.assertIsNone(db.session.get(UploadSession, upload['upload_id']))
+
+    def test_limits(self):
+        """Oversized files and wrongly sized parts are refused"""
+        response = self.client.post('/uploads', json={'filename': 'a.pdf', 'size': Config.UPLOAD_MAX_FILE_SIZE + 1})
+        self.assertEqual(response.status_code, 413)
+        response = self.client.post('/uploads', json={'filename': 'a.exe', 'size': 10})
+        self.assertEqual(response.status_code, 400)
+
+        upload = self.client.post('/uploads', json={'filename': 'a.pdf', 'size': 10}).get_json()
+        self.assertEqual(self._put_part(upload['upload_id'], 1, b'short').status_code, 400)
+        self.assertEqual(self._put_part(upload['upload_id'], 2, b'0123456789').status_code, 400)
+
+        response = self.client.delete(f"/uploads/{upload['upload_id']}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.s3.uploads, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import io
+import logging
+import time
+import unittest
+from unittest import mock
+from concurrent.futures import ThreadPoolExecutor
+from app.config import Config
+from app.utils import duplicates, file_processor
+from database import DatabaseTestCase
+
+logger = logging.getLogger(__name__)
+PARALLEL_CLIENTS = 50
+
+def parsed_resume(file_path, file_extension):
+    """Stand-in for NER parsing: the resume's only line is its email"""
+    with open(file_path) as f:
+        email = f.read().strip()
+    return {
+        'full_name': 'Load Test', 'email': email, 'phone': None, 'location': None,
+        'years_experience': 2, 'education': [], 'skills': []
+    }
+
+class TestConcurrentUploads(DatabaseTestCase):
+    def setUp(self):
+        patches = [
+            mock.patch.object(file_processor, '_s3_client', mock.Mock()),
+            mock.patch.object(duplicates, '_known_emails', None),
+            mock.patch.object(Config, 'CPU_WORKERS', 0),
+            mock.patch('app.routes.parse_resume', side_effect=parsed_resume),
+            mock.patch('app.routes.use_pgvector', return_value=False),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        from app.models import db, Candidate
+        with self.app.app_context():
+            Candidate.query.filter(Candidate.email.ilike('concurrent-%@example.com'))\
+                .delete(synchronize_session=False)
+            db.session.commit()
+
+    def _upload(self, email):
+        return self.app.test_client().post('/upload', data={'resume': (io.BytesIO(email.encode()), 'resume.txt')},
+                                           content_type='multipart/form-data')
+
+    def test_parallel_uploads_with_duplicates(self):
+        """50 parallel uploads; each email is created once and its duplicate gets a 409"""
+        # Every email is submitted twice, once upper-cased
+        emails = []
+        for i in range(PARALLEL_CLIENTS // 2):
+            emails.append(f'concurrent-{i}@example.com')
+            emails.append(f'CONCURRENT-{i}@Example.com')
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=PARALLEL_CLIENTS) as pool:
+            statuses = [response.status_code for response in pool.map(self._upload, emails)]
+        elapsed = time.perf_counter() - start
+        # Reported through logging (pytest --log-cli-level=INFO), not asserted on
+        logger.info(f"{len(emails)} uploads from {PARALLEL_CLIENTS} clients in {elapsed:.2f}s "
+                    f"({len(emails) / elapsed:.1f} uploads/s)")
+
+        for i in range(0, len(emails), 2):
+            self.assertEqual(sorted(statuses[i:i + 2]), [201, 409], emails[i])
+
+        from app.models import Candidate
+        with self.app.app_context():
+            stored = Candidate.query.filter(Candidate.email.ilike('concurrent-%@example.com')).count()
+        self.assertEqual(stored, PARALLEL_CLIENTS // 2)
+
+if __name__ == '__main__':
+    unittest.main()
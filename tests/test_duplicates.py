@@ -0,0 +1,96 @@
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+from app.config import Config
+from app.utils import duplicates, file_processor
+from app.utils.duplicates import BloomFilter
+from app.utils.parser import extract_email
+from database import DatabaseTestCase
+
+class TestBloomFilter(unittest.TestCase):
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000)
+        emails = [f'user{i}@example.com' for i in range(1000)]
+        for email in emails:
+            bloom.add(email)
+        self.assertTrue(all(email in bloom for email in emails))
+
+    def test_false_positive_rate(self):
+        """At capacity the false-positive rate stays near the configured target"""
+        bloom = BloomFilter(10000, error_rate=0.01)
+        for i in range(10000):
+            bloom.add(f'user{i}@example.com')
+        false_positives = sum(f'other{i}@example.com' in bloom for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.02)
+
+class TestExtractEmail(unittest.TestCase):
+    def test_first_email_in_document_order(self):
+        """The pre-parse picks the same email parse_resume stores"""
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write('Jane Doe\njane.doe@example.com\nReferences: boss@example.org\n')
+        try:
+            self.assertEqual(extract_email(f.name, 'txt'), 'jane.doe@example.com')
+        finally:
+            os.unlink(f.name)
+
+    def test_no_email(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write('No contact details here')
+        try:
+            self.assertIsNone(extract_email(f.name, 'txt'))
+        finally:
+            os.unlink(f.name)
+
+class TestEarlyDuplicateRejection(DatabaseTestCase):
+    def setUp(self):
+        self.s3 = mock.Mock()
+        self.parse = mock.Mock(return_value={
+            'full_name': 'Early Duplicate', 'email': 'early-duplicate@example.com',
+            'phone': None, 'location': None, 'years_experience': 2,
+            'education': [], 'skills': []
+        })
+        patches = [
+            mock.patch.object(file_processor, '_s3_client', self.s3),
+            mock.patch.object(duplicates, '_known_emails', None),
+            mock.patch.object(Config, 'CPU_WORKERS', 0),
+            mock.patch('app.routes.parse_resume', self.parse),
+            mock.patch('app.routes.use_pgvector', return_value=False),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        from app.models import db, Candidate
+        with self.app.app_context():
+            Candidate.query.filter_by(email='early-duplicate@example.com').delete()
+            db.session.commit()
+
+    def _upload(self):
+        content = b'Early Duplicate\nEARLY-DUPLICATE@example.com\n'
+        return self.app.test_client().post('/upload', data={'resume': (io.BytesIO(content), 'resume.txt')},
+                                           content_type='multipart/form-data')
+
+    def test_duplicate_skips_parse_and_s3(self):
+        """A known email is rejected before NER or S3 run"""
+        self.assertEqual(self._upload().status_code, 201)
+        self.assertEqual(self.parse.call_count, 1)
+        self.assertEqual(self.s3.upload_fileobj.call_count, 1)
+
+        response = self._upload()
+        self.assertEqual(response.status_code, 409)
+        self.assertIsNotNone(response.get_json()['existing_candidate_id'])
+        self.assertEqual(self.parse.call_count, 1)
+        self.assertEqual(self.s3.upload_fileobj.call_count, 1)
+        self.s3.delete_object.assert_not_called()
+
+    def test_new_email_skips_lookup(self):
+        """Emails absent from the filter never reach the indexed lookup"""
+        with self.app.app_context(), mock.patch.object(duplicates.Candidate, 'find_by_email') as lookup:
+            self.assertIsNone(duplicates.find_existing_candidate('never-seen@example.com'))
+            lookup.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from app.config import Config
+from app.utils.encoder import EncoderService
+
+class TestEncoderService(unittest.TestCase):
+    texts = [
+        "Python developer with Flask and AWS experience",
+        "Security analyst familiar with SIEM tooling",
+        "Data scientist skilled in PyTorch and scikit-learn",
+        "Graphic designer proficient in Photoshop",
+    ]
+
+    def _check_service(self, service):
+        """Concurrent single-text requests match one direct batch encode"""
+        try:
+            expected = service.encode(self.texts)
+            with ThreadPoolExecutor(max_workers=len(self.texts)) as pool:
+                rows = list(pool.map(lambda text: service.encode([text])[0], self.texts))
+            np.testing.assert_allclose(np.vstack(rows), expected, rtol=1e-4, atol=1e-5)
+            
+            metrics = service.metrics()
+            self.assertEqual(metrics['requests'], 1 + len(self.texts))
+            self.assertEqual(metrics['texts'], 2 * len(self.texts))
+            self.assertLessEqual(metrics['batches'], 1 + len(self.texts))
+            self.assertEqual(metrics['errors'], 0)
+        finally:
+            service.shutdown()
+
+    def test_in_process_encoder(self):
+        self._check_service(EncoderService(Config.ENCODER_MODEL_NAME, num_workers=0, max_wait_ms=50))
+
+    def test_worker_process_encoder(self):
+        self._check_service(EncoderService(Config.ENCODER_MODEL_NAME, num_workers=2,
+                                           threads_per_worker=1, max_wait_ms=50))
+
+    def test_large_request_is_split(self):
+        """Requests larger than max_batch_size are split across batches"""
+        service = EncoderService(Config.ENCODER_MODEL_NAME, num_workers=0, max_batch_size=3)
+        try:
+            embeddings = service.encode(self.texts * 2)
+            self.assertEqual(embeddings.shape[0], len(self.texts) * 2)
+            self.assertGreaterEqual(service.metrics()['batches'], 3)
+        finally:
+            service.shutdown()
+
+    def test_lone_request_skips_the_wait(self):
+        """With nothing else queued or running a request is sent without lingering"""
+        service = EncoderService(Config.ENCODER_MODEL_NAME, num_workers=0, max_wait_ms=2000)
+        try:
+            service.encode(self.texts[:1])
+            start = time.perf_counter()
+            service.encode(self.texts[1:2])
+            self.assertLess(time.perf_counter() - start, 1.0)
+        finally:
+            service.shutdown()
+
+    def test_empty_request_keeps_dimension(self):
+        service = EncoderService(Config.ENCODER_MODEL_NAME, num_workers=0, dimension=7)
+        try:
+            self.assertEqual(service.encode([]).shape, (0, 7))
+            dimension = service.encode(self.texts[:1]).shape[1]
+            self.assertEqual(service.encode([]).shape, (0, dimension))
+        finally:
+            service.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from app.config import Config
+from app.utils.encoder_backends import load_backend
+from app.utils.parser import extract_text
+
+try:
+    import onnxruntime  # noqa: F401
+    HAS_ONNXRUNTIME = True
+except ImportError:
+    HAS_ONNXRUNTIME = False
+
+def cosine(a, b):
+    return (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+
+class TestEncoderBackends(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Encode the test_resumes corpus once with the PyTorch reference path"""
+        cls.onnx_dir = tempfile.mkdtemp()
+        cls.onnx_patch = mock.patch.object(Config, 'ENCODER_ONNX_DIR', cls.onnx_dir)
+        cls.onnx_patch.start()
+        
+        cls.texts = []
+        for filename in sorted(os.listdir('test_resumes')):
+            file_ext = os.path.splitext(filename)[1][1:].lower()
+            text = extract_text(os.path.join('test_resumes', filename), file_ext)
+            cls.texts.extend(line.strip() for line in text.split('\n') if len(line.strip()) > 20)
+        cls.reference = load_backend(Config.ENCODER_MODEL_NAME, 'torch').encode(cls.texts)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.onnx_patch.stop()
+        shutil.rmtree(cls.onnx_dir, ignore_errors=True)
+
+    def test_torch_int8_within_tolerance(self):
+        """Dynamic int8 quantization stays close to the float model"""
+        backend = load_backend(Config.ENCODER_MODEL_NAME, 'torch-int8')
+        self.assertEqual(backend.name, 'torch-int8')
+        self.assertGreater(cosine(backend.encode(self.texts), self.reference).min(), 0.98)
+
+    @unittest.skipUnless(HAS_ONNXRUNTIME, 'onnxruntime not installed')
+    def test_onnx_matches_torch(self):
+        """The exported graph reproduces PyTorch embeddings"""
+        backend = load_backend(Config.ENCODER_MODEL_NAME, 'onnx', num_threads=1)
+        self.assertEqual(backend.name, 'onnx')
+        np.testing.assert_allclose(backend.encode(self.texts), self.reference, atol=1e-4)
+
+    @unittest.skipUnless(HAS_ONNXRUNTIME, 'onnxruntime not installed')
+    def test_onnx_int8_within_tolerance(self):
+        backend = load_backend(Config.ENCODER_MODEL_NAME, 'onnx-int8', num_threads=1)
+        self.assertEqual(backend.name, 'onnx-int8')
+        self.assertGreater(cosine(backend.encode(self.texts), self.reference).min(), 0.98)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            load_backend(Config.ENCODER_MODEL_NAME, 'tensorrt')
+
+if __name__ == '__main__':
+    unittest.main()
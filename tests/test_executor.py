@@ -0,0 +1,30 @@
+import unittest
+from unittest import mock
+from app.config import Config
+from app.utils import executor
+
+class TestCPUExecutor(unittest.TestCase):
+    def test_runs_in_process_pool(self):
+        """CPU-bound calls are executed by the worker pool once it is enabled"""
+        with mock.patch.object(Config, 'CPU_WORKERS', 2):
+            self.assertIsNotNone(executor.get_process_pool())
+            self.assertEqual(executor.run_cpu_bound(pow, 2, 10), 1024)
+
+    def test_runs_inline_without_workers(self):
+        """CPU_WORKERS=0, the default, runs calls in the request thread"""
+        with mock.patch.object(Config, 'CPU_WORKERS', 0):
+            self.assertIsNone(executor.get_process_pool())
+            self.assertEqual(executor.run_cpu_bound(sum, [1, 2, 3]), 6)
+
+    def test_rejects_when_queue_is_full(self):
+        """Callers get WorkerPoolBusyError instead of queueing without bound"""
+        slots = mock.Mock()
+        slots.acquire.return_value = False
+        with mock.patch.object(executor, '_pending_slots', slots), \
+                mock.patch.object(Config, 'CPU_WORKERS', 2), \
+                mock.patch.object(Config, 'CPU_WORKER_QUEUE_TIMEOUT', 0):
+            with self.assertRaises(executor.WorkerPoolBusyError):
+                executor.run_cpu_bound(pow, 2, 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+from unittest import mock
+import numpy as np
+from app.utils import feature_store
+from app.utils.feature_store import CandidateFeatureStore, profile_hash
+from app.utils.shortlister import _normalize_rows
+from database import DatabaseTestCase
+
+def fake_encode(texts):
+    """Deterministic stand-in for the encoder service"""
+    return np.stack([np.random.default_rng(profile_hash(text) % 2 ** 32).normal(size=8) for text in texts])
+
+class TestCandidateFeatureStore(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.embeddings = rng.normal(size=(50, 8)).astype(np.float32)
+        self.store = CandidateFeatureStore(8, capacity=4)
+        self.store.upsert_many(
+            list(range(1, 51)),
+            [None if i % 10 == 0 else i % 7 for i in range(1, 51)],
+            ['shortlisted' if i % 5 == 0 else 'pending' for i in range(1, 51)],
+            [[i % 3, 100 + i % 2] for i in range(1, 51)],
+            self.embeddings,
+            list(range(1, 51))
+        )
+
+    def test_ranking_matches_cosine_similarity(self):
+        job = np.random.default_rng(1).normal(size=(2, 8))
+        total, ranked = self.store.top_candidates(job, top_percent=10, chunk_size=7)
+        expected = _normalize_rows(job) @ _normalize_rows(self.embeddings).T
+
+        self.assertEqual(total, 50)
+        for row, results in zip(expected, ranked):
+            self.assertEqual([candidate_id for candidate_id, _ in results], list(np.argsort(-row)[:5] + 1))
+            np.testing.assert_allclose([score for _, score in results], np.sort(row)[::-1][:5], rtol=1e-5)
+
+    def test_streaming_converges_on_ranking(self):
+        """Chunked progress ends on the same top candidates as a one-shot ranking"""
+        job = np.random.default_rng(2).normal(size=8)
+        candidate_ids = self.store.matching_ids()
+        updates = self.store.iter_top_candidates(job, candidate_ids, top_percent=10, chunk_size=7)
+
+        processed, total, _ = next(updates)
+        self.assertEqual((processed, total), (7, 50))
+        # Rows deleted while the stream runs are skipped, not mis-scored
+        removed = int(candidate_ids[-1])
+        self.store.remove([removed])
+        updates = list(updates)
+        self.assertEqual([processed for processed, _, _ in updates], [14, 21, 28, 35, 42, 49, 50])
+
+        _, (expected,) = self.store.top_candidates(job[None, :], top_percent=10)
+        final = updates[-1][2]
+        self.assertEqual([candidate_id for candidate_id, _ in final], [candidate_id for candidate_id, _ in expected])
+        np.testing.assert_allclose([score for _, score in final], [score for _, score in expected], rtol=1e-5)
+
+    def test_filters(self):
+        job = np.ones((1, 8))
+        total, _ = self.store.top_candidates(job, min_experience=5)
+        self.assertEqual(total, sum(1 for i in range(1, 51) if i % 10 and i % 7 >= 5))
+        total, (ranked,) = self.store.top_candidates(job, top_percent=100, status='shortlisted')
+        self.assertEqual(sorted(candidate_id for candidate_id, _ in ranked), list(range(5, 51, 5)))
+        total, (ranked,) = self.store.top_candidates(job, top_percent=100, skill_ids=[2, 101])
+        self.assertEqual(sorted(candidate_id for candidate_id, _ in ranked),
+                         [i for i in range(1, 51) if i % 3 == 2 and i % 2 == 1])
+        self.assertEqual(self.store.top_candidates(job, status='archived'), (0, [[]]))
+
+    def test_remove_swaps_last_row_in(self):
+        self.store.remove([1, 25, 999])
+        self.assertEqual(self.store.size, 48)
+        self.assertEqual(sorted(self.store.ids[:48]), [i for i in range(1, 51) if i not in (1, 25)])
+
+        # Every remaining row still carries its own features
+        rows = self.store._rows_of(list(range(2, 51)))
+        for candidate_id, row in zip(range(2, 51), rows):
+            if candidate_id == 25:
+                self.assertEqual(row, -1)
+                continue
+            np.testing.assert_allclose(self.store.embeddings[row] * np.linalg.norm(self.embeddings[candidate_id - 1]),
+                                       self.embeddings[candidate_id - 1], rtol=1e-5)
+            self.assertEqual(self.store.profile_hashes[row], candidate_id)
+
+    def test_upsert_replaces_and_compacts_skills(self):
+        for _ in range(100):
+            self.store.upsert(7, 12, 'pending', [42], self.embeddings[0], 7)
+        self.assertEqual(self.store.size, 50)
+        self.assertLess(len(self.store.skill_ids), 1000)
+
+        total, (ranked,) = self.store.top_candidates(np.ones((1, 8)), top_percent=100, skill_ids=[42],
+                                                     min_experience=12)
+        self.assertEqual([candidate_id for candidate_id, _ in ranked], [7])
+        _, (ranked,) = self.store.top_candidates(np.ones((1, 8)), top_percent=100, skill_ids=[0])
+        self.assertEqual(sorted(candidate_id for candidate_id, _ in ranked), list(range(3, 51, 3)))
+
+    def test_set_status(self):
+        self.store.set_status([1, 2, 999], 'shortlisted')
+        self.assertEqual(self.store.top_candidates(np.ones((1, 8)), status='shortlisted')[0], 12)
+
+class TestFeatureStoreRefresh(DatabaseTestCase):
+    def setUp(self):
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        patch = mock.patch.object(feature_store, 'encode_texts', side_effect=fake_encode)
+        self.encode = patch.start()
+        self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        from app.models import db, Candidate
+        db.session.rollback()
+        Candidate.query.filter(Candidate.email.like('feature-store-%')).delete(synchronize_session=False)
+        db.session.commit()
+        self.ctx.pop()
+
+    def _add(self, index, **values):
+        from app.models import db, Candidate
+        candidate = Candidate(full_name=f'Store {index}', email=f'feature-store-{index}@example.com',
+                              profile_text=f'Candidate Profile: store {index}', status='pending', **values)
+        db.session.add(candidate)
+        db.session.commit()
+        return candidate
+
+    def test_refresh_tracks_inserts_updates_and_deletes(self):
+        from app.models import db
+        first, second = self._add(1, years_experience=3), self._add(2)
+        store = CandidateFeatureStore(8)
+        store.refresh(force=True)
+        baseline = store.size
+        self.assertTrue((store._rows_of([first.candidate_id, second.candidate_id]) >= 0).all())
+
+        # Status changes keep the embedding; profile changes re-encode only that row
+        self.encode.reset_mock()
+        first.status = 'shortlisted'
+        second.profile_text = 'Candidate Profile: rewritten'
+        third = self._add(3)
+        store.refresh(force=True)
+        encoded = [text for call in self.encode.call_args_list for text in call.args[0]]
+        self.assertEqual(sorted(encoded), ['Candidate Profile: rewritten', 'Candidate Profile: store 3'])
+        self.assertEqual(store.size, baseline + 1)
+        row = store._rows_of([first.candidate_id])[0]
+        self.assertEqual(store.status[row], store._status_codes['shortlisted'])
+        self.assertEqual(store.years_experience[row], 3)
+
+        second_id, third_id = second.candidate_id, third.candidate_id
+        db.session.delete(second)
+        db.session.commit()
+        store.refresh(force=True)
+        self.assertEqual(store.size, baseline)
+        self.assertEqual(list(store._rows_of([second_id, third_id]) >= 0), [False, True])
+
+if __name__ == '__main__':
+    unittest.main()
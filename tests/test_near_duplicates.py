@@ -0,0 +1,144 @@
+import io
+import unittest
+from unittest import mock
+from app.config import Config
+from app.utils import file_processor
+from app.utils.minhash import minhash_signature, band_hashes, estimate_similarity
+from database import DatabaseTestCase
+
+RESUME = """
+Jane Doe, Senior Software Engineer. Eight years building distributed systems in Python and Go.
+Led the migration of a payments platform to Kubernetes on AWS, cutting deployment time by half.
+Designed event-driven services with Kafka and PostgreSQL handling two million requests per day.
+Mentored six engineers and ran the backend hiring loop. BSc Computer Science, University of Leeds, 2014.
+Skills: Python, Go, Kubernetes, AWS, Kafka, PostgreSQL, Terraform, gRPC, observability.
+"""
+# Same resume, new contact line and one reworded sentence
+RESUME_VARIANT = "jane.d.alt@example.com\n" + RESUME.replace("cutting deployment time by half", "halving deploy time")
+OTHER_RESUME = """
+Raj Patel, Data Analyst. Three years of reporting and dashboarding with SQL, Excel and Tableau.
+Built monthly revenue forecasts for the retail team and automated weekly KPI emails.
+MSc Statistics, University of Manchester, 2020. Skills: SQL, Tableau, Excel, R, forecasting.
+"""
+
+class TestMinHash(unittest.TestCase):
+    def test_similarity_tracks_overlap(self):
+        signature = minhash_signature(RESUME)
+        self.assertEqual(estimate_similarity(signature, minhash_signature(RESUME)), 1.0)
+        self.assertGreater(estimate_similarity(signature, minhash_signature(RESUME_VARIANT)), 0.7)
+        self.assertLess(estimate_similarity(signature, minhash_signature(OTHER_RESUME)), 0.1)
+
+    def test_normalizes_case_and_punctuation(self):
+        self.assertEqual(estimate_similarity(minhash_signature(RESUME),
+                                             minhash_signature(RESUME.upper().replace(',', ' '))), 1.0)
+
+    def test_empty_text(self):
+        self.assertIsNone(minhash_signature('  \n '))
+
+    def test_band_hashes_are_stable(self):
+        signature = minhash_signature(RESUME)
+        self.assertEqual(len(band_hashes(signature, 16)), 16)
+        self.assertEqual(band_hashes(signature, 16), band_hashes(signature.copy(), 16))
+        self.assertTrue(all(0 <= bucket < 2 ** 63 for bucket in band_hashes(signature, 16)))
+
+class TestNearDuplicateIndex(DatabaseTestCase):
+    def setUp(self):
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+
+    def tearDown(self):
+        from app.models import db, Candidate, Shortlist, JobDescription
+        db.session.rollback()
+        ids = [c.candidate_id for c in Candidate.query.filter(Candidate.email.like('near-dup-%'))]
+        Shortlist.query.filter(Shortlist.candidate_id.in_(ids)).delete(synchronize_session=False)
+        JobDescription.query.filter_by(description='near-dup job').delete()
+        Candidate.query.filter(Candidate.candidate_id.in_(ids)).update({'duplicate_of_id': None})
+        for candidate in Candidate.query.filter(Candidate.candidate_id.in_(ids)):
+            db.session.delete(candidate)
+        db.session.commit()
+        self.ctx.pop()
+
+    def _candidate(self, email, text, **values):
+        from app.models import db, Candidate
+        from app.utils.duplicates import store_signature
+        candidate = Candidate(full_name='Jane Doe', email=email, **values)
+        db.session.add(candidate)
+        db.session.flush()
+        store_signature(candidate.candidate_id, minhash_signature(text))
+        return candidate
+
+    def test_lsh_finds_reworded_resume(self):
+        from app.utils.duplicates import find_near_duplicates
+        original = self._candidate('near-dup-1@example.com', RESUME)
+        self._candidate('near-dup-2@example.com', OTHER_RESUME)
+
+        with mock.patch.object(Config, 'NEAR_DUPLICATE_THRESHOLD', 0.7):
+            matches = find_near_duplicates(minhash_signature(RESUME_VARIANT))
+            self.assertEqual([m[0] for m in matches], [original.candidate_id])
+            self.assertEqual(find_near_duplicates(minhash_signature(RESUME), exclude_id=original.candidate_id), [])
+
+    def test_match_cap_keeps_most_shared_bands(self):
+        """Candidates that share a single crowded bucket do not push out the real match"""
+        from app.models import db, CandidateLshBucket
+        from app.utils.duplicates import find_near_duplicates
+        query = minhash_signature(RESUME)
+        crowded_bucket = band_hashes(query, Config.MINHASH_BANDS)[0]
+        for i in range(5):
+            decoy = self._candidate(f'near-dup-decoy-{i}@example.com', OTHER_RESUME)
+            db.session.merge(CandidateLshBucket(band=0, bucket=crowded_bucket, candidate_id=decoy.candidate_id))
+        original = self._candidate('near-dup-1@example.com', RESUME)
+        db.session.flush()
+
+        with mock.patch.object(Config, 'NEAR_DUPLICATE_THRESHOLD', 0.7), \
+                mock.patch.object(Config, 'NEAR_DUPLICATE_MAX_MATCHES', 1):
+            self.assertEqual([m[0] for m in find_near_duplicates(query)], [original.candidate_id])
+
+    def test_merge_folds_duplicate_into_original(self):
+        from app.models import db, Candidate, Skill, JobDescription, Shortlist
+        from app.utils.duplicates import merge_candidate
+        original = self._candidate('near-dup-1@example.com', RESUME, years_experience=6)
+        duplicate = self._candidate('near-dup-2@example.com', RESUME_VARIANT, years_experience=8,
+                                    phone='555-0100', status='shortlisted',
+                                    duplicate_of_id=original.candidate_id, duplicate_score=0.9)
+        original.skills.append(Skill(skill_name='Python'))
+        duplicate.skills.extend([Skill(skill_name='python'), Skill(skill_name='Kafka')])
+        jd = JobDescription(description='near-dup job')
+        db.session.add(jd)
+        db.session.flush()
+        db.session.add(Shortlist(job_description_id=jd.id, candidate_id=duplicate.candidate_id, score=0.5))
+        db.session.flush()
+
+        merge_candidate(duplicate, original)
+        db.session.commit()
+
+        self.assertIsNone(db.session.get(Candidate, duplicate.candidate_id))
+        self.assertEqual(sorted(s.skill_name for s in original.skills), ['Kafka', 'Python'])
+        self.assertEqual((original.years_experience, original.phone, original.status), (8, '555-0100', 'shortlisted'))
+        self.assertEqual([s.candidate_id for s in Shortlist.query.filter_by(job_description_id=jd.id)],
+                         [original.candidate_id])
+
+    def test_upload_flags_near_duplicate(self):
+        from app.models import db
+        original = self._candidate('near-dup-1@example.com', RESUME)
+        db.session.commit()
+
+        parsed = {
+            'full_name': 'Jane Doe', 'email': 'near-dup-2@example.com', 'phone': None,
+            'location': None, 'years_experience': 8, 'education': [], 'skills': [],
+            'minhash': minhash_signature(RESUME_VARIANT)
+        }
+        with mock.patch.object(file_processor, '_s3_client', mock.Mock()), \
+                mock.patch.object(Config, 'CPU_WORKERS', 0), \
+                mock.patch.object(Config, 'NEAR_DUPLICATE_THRESHOLD', 0.7), \
+                mock.patch('app.routes.parse_resume', return_value=parsed), \
+                mock.patch('app.routes.extract_email', return_value=None), \
+                mock.patch('app.routes.use_pgvector', return_value=False):
+            response = self.app.test_client().post(
+                '/upload', data={'resume': (io.BytesIO(RESUME_VARIANT.encode()), 'resume.txt')},
+                content_type='multipart/form-data')
+
+        self.assertEqual(response.status_code, 201, response.get_json())
+        self.assertEqual(response.get_json()['possible_duplicate_of']['candidate_id'], original.candidate_id)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+from unittest import mock
+from app.utils import response_cache
+from app.utils.response_cache import ResponseCache
+from database import DatabaseTestCase
+
+class TestPageStore(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.set('a', 'xxxx')
+        cache.set('b', 'yyyy')
+        cache.get('a')
+        cache.set('c', 'zzzz')
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), ('xxxx', None, 'zzzz'))
+
+    def test_skips_pages_over_budget(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.set('a', 'x' * 11)
+        self.assertIsNone(cache.get('a'))
+
+class TestCachedPages(DatabaseTestCase):
+    def setUp(self):
+        from app import routes
+        self.render = mock.Mock(side_effect=routes.render_template)
+        self.s3_url = mock.Mock(return_value='https://bucket.s3.region.amazonaws.com/resumes/cached.pdf')
+        patches = [
+            mock.patch.object(response_cache, '_cache', None),
+            mock.patch.object(routes, 'render_template', self.render),
+            mock.patch.object(routes, 'get_s3_url', self.s3_url),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        from app.models import db, Candidate, JobDescription, Shortlist
+        with self.app.app_context():
+            jd_ids = [jd.id for jd in JobDescription.query.filter_by(description='cached job')]
+            Shortlist.query.filter(Shortlist.job_description_id.in_(jd_ids)).delete(synchronize_session=False)
+            JobDescription.query.filter(JobDescription.id.in_(jd_ids)).delete(synchronize_session=False)
+            Candidate.query.filter_by(email='cached-page@example.com').delete()
+            db.session.commit()
+
+    def _candidate(self):
+        from app.models import db, Candidate
+        with self.app.app_context():
+            candidate = Candidate(full_name='Cached Page', email='cached-page@example.com',
+                                  resume_file_path='resumes/cached.pdf')
+            db.session.add(candidate)
+            db.session.commit()
+            return candidate.candidate_id
+
+    def test_repeat_views_skip_the_view(self):
+        candidate_id = self._candidate()
+        for _ in range(3):
+            response = self.client.get(f'/candidate/{candidate_id}')
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b'Cached Page', response.data)
+        self.assertEqual(self.render.call_count, 1)
+        self.assertEqual(self.s3_url.call_count, 1)
+
+    def test_conditional_get(self):
+        self._candidate()
+        response = self.client.get('/candidates')
+        etag = response.headers['ETag']
+        self.assertIn('no-cache', response.headers['Cache-Control'])
+
+        revalidated = self.client.get('/candidates', headers={'If-None-Match': etag})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.headers['ETag'], etag)
+        self.assertEqual(self.render.call_count, 1)
+
+    def test_writes_invalidate_dependent_pages(self):
+        from app.models import db, JobDescription, Shortlist
+        candidate_id = self._candidate()
+        with self.app.app_context():
+            jd = JobDescription(description='cached job')
+            db.session.add(jd)
+            db.session.flush()
+            shortlist = Shortlist(job_description_id=jd.id, candidate_id=candidate_id, score=0.9)
+            db.session.add(shortlist)
+            response_cache.bump_versions('job_descriptions', 'shortlists')
+            db.session.commit()
+            jd_id, shortlist_id = jd.id, shortlist.id
+
+        page = self.client.get(f'/job_description/{jd_id}')
+        self.assertIn(b'Shortlisted Candidates (1)', page.data)
+        candidates_etag = self.client.get('/candidates').headers['ETag']
+
+        self.assertTrue(self.client.post(f'/shortlist/{shortlist_id}/delete').get_json()['success'])
+
+        # The job description page is rebuilt; the candidate list is not
+        updated = self.client.get(f'/job_description/{jd_id}', headers={'If-None-Match': page.headers['ETag']})
+        self.assertEqual(updated.status_code, 200)
+        self.assertIn(b'Shortlisted Candidates (0)', updated.data)
+        self.assertEqual(self.client.get('/candidates', headers={'If-None-Match': candidates_etag}).status_code, 304)
+
+    def test_query_string_is_part_of_the_key(self):
+        self._candidate()
+        first = self.client.get('/candidates')
+        other = self.client.get('/candidates?page=2')
+        self.assertNotEqual(first.headers['ETag'], other.headers['ETag'])
+        self.assertEqual(self.render.call_count, 2)
+
+    def test_non_str_views_are_refused(self):
+        view = response_cache.cached_page('candidates')(lambda: b'<html></html>')
+        with self.app.test_request_context('/'):
+            with self.assertRaises(TypeError):
+                view()
+
+    def test_repeated_tables_bump_once(self):
+        from app.models import db, CacheVersion
+        with self.app.app_context():
+            before = {row.table_name: row.version for row in CacheVersion.query}
+            response_cache.bump_versions('shortlists', 'candidates', 'shortlists')
+            db.session.commit()
+            after = {row.table_name: row.version for row in CacheVersion.query}
+        for table in ('candidates', 'shortlists'):
+            self.assertEqual(after[table], before.get(table, 0) + 1)
+
+    def test_rebuild_profiles_invalidates_candidate_pages(self):
+        candidate_id = self._candidate()
+        self.client.get(f'/candidate/{candidate_id}')
+        result = self.app.test_cli_runner().invoke(args=['rebuild-profiles'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.client.get(f'/candidate/{candidate_id}')
+        self.assertEqual(self.render.call_count, 2)
+
+    def test_rolled_back_bump_keeps_cache(self):
+        from app.models import db
+        self._candidate()
+        self.client.get('/candidates')
+        with self.app.app_context():
+            response_cache.bump_versions('candidates')
+            db.session.rollback()
+        self.client.get('/candidates')
+        self.assertEqual(self.render.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
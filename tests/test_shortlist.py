@@ -1,7 +1,14 @@
 import os
+import json
 import unittest
+from unittest import mock
+from app.config import Config
 from app.utils.parser import parse_resume
-from app.utils.shortlister import rank_candidates
+import numpy as np
+from app.utils import feature_store
+from app.utils.shortlister import encode_texts, get_candidate_text
+from app.utils.feature_store import CandidateFeatureStore
+from database import DatabaseTestCase
 
 class TestShortlistingSystem(unittest.TestCase):
     @classmethod
@@ -55,7 +62,15 @@ class TestShortlistingSystem(unittest.TestCase):
                     self.fail(f"Error processing {filename}: {str(e)}")
 
         # 2. Test shortlisting with realistic job description
-        ranked_candidates = rank_candidates(self.job_description, candidates_data)
+        embeddings = encode_texts([get_candidate_text(candidate) for candidate in candidates_data])
+        store = CandidateFeatureStore(embeddings.shape[1])
+        store.upsert_many([c['candidate_id'] for c in candidates_data], [c['years_experience'] for c in candidates_data],
+                          ['pending'] * len(candidates_data), [[] for _ in candidates_data], embeddings,
+                          list(range(len(candidates_data))))
+        _, (ranked,) = store.top_candidates(encode_texts([self.job_description]))
+        by_id = {c['candidate_id']: c for c in candidates_data}
+        ranked_candidates = [{'candidate_id': candidate_id, 'similarity_score': score, 'data': by_id[candidate_id]}
+                             for candidate_id, score in ranked]
         
         # Basic validation of shortlisting results
         self.assertTrue(len(ranked_candidates) > 0, "No candidates were ranked")
@@ -77,5 +92,96 @@ class TestShortlistingSystem(unittest.TestCase):
             top_skills = ', '.join([s['name'] for s in candidate['data']['skills'][:3]])
             print(f"{i:<5} | {candidate['similarity_score']:.4f} | {candidate['data']['full_name']:<20} | {top_skills}")
 
+KEYWORDS = ['kw-python', 'kw-security', 'kw-design', 'kw-data']
+
+def keyword_encode(texts):
+    """Stand-in for the encoder: one dimension per keyword the text mentions"""
+    return np.array([[float(keyword in text) for keyword in KEYWORDS] for text in texts], dtype=np.float32)
+
+class TestShortlistRoutes(DatabaseTestCase):
+    """/shortlist/batch and /shortlist/stream rank through the candidate feature store"""
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(Config, 'EMBEDDING_DIMENSION', len(KEYWORDS)),
+            mock.patch.object(feature_store, '_store', None),
+            mock.patch.object(feature_store, 'encode_texts', side_effect=keyword_encode),
+            mock.patch('app.routes.encode_texts', side_effect=keyword_encode),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        from app.models import db, Candidate
+        self.client = self.app.test_client()
+        self.ids = {}
+        with self.app.app_context():
+            for keyword in KEYWORDS:
+                candidate = Candidate(full_name=f'Route {keyword}', email=f'shortlist-route-{keyword}@example.com',
+                                      profile_text=f'Candidate Profile: {keyword}', status='pending')
+                db.session.add(candidate)
+                db.session.flush()
+                self.ids[keyword] = candidate.candidate_id
+            db.session.commit()
+            self.pool_size = Candidate.query.count()
+
+    def tearDown(self):
+        from app.models import db, Candidate, JobDescription, Shortlist
+        with self.app.app_context():
+            jd_ids = [jd.id for jd in JobDescription.query.filter(JobDescription.description.like('kw-%'))]
+            Shortlist.query.filter(Shortlist.job_description_id.in_(jd_ids)).delete(synchronize_session=False)
+            JobDescription.query.filter(JobDescription.id.in_(jd_ids)).delete(synchronize_session=False)
+            Candidate.query.filter(Candidate.email.like('shortlist-route-%')).delete(synchronize_session=False)
+            db.session.commit()
+
+    def _status(self, keyword):
+        from app.models import Candidate
+        with self.app.app_context():
+            return Candidate.query.get(self.ids[keyword]).status
+
+    def test_batch_ranks_every_job_description(self):
+        response = self.client.post('/shortlist/batch', json={'job_descriptions': ['kw-python role', 'kw-security role']})
+        self.assertEqual(response.status_code, 200, response.get_json())
+        body = response.get_json()
+        self.assertEqual(body['total_candidates'], self.pool_size)
+        self.assertEqual([result['top_candidates'][0]['candidate_id'] for result in body['results']],
+                         [self.ids['kw-python'], self.ids['kw-security']])
+        self.assertEqual((self._status('kw-python'), self._status('kw-design')), ('shortlisted', 'pending'))
+
+        # The store mirrors the committed status without a refresh
+        store = feature_store.loaded_feature_store()
+        row = store._rows_of([self.ids['kw-python']])[0]
+        self.assertEqual(store.status[row], store._status_codes['shortlisted'])
+
+    def test_batch_rejects_bad_input(self):
+        self.assertEqual(self.client.post('/shortlist/batch', json={'job_descriptions': 'kw-python'}).status_code, 400)
+        self.assertEqual(self.client.post('/shortlist/batch', json={'job_descriptions': ['  ']}).status_code, 400)
+        self.assertEqual(self.client.post('/shortlist/batch', json=['kw-python role']).status_code, 400)
+
+    def test_batch_encoder_failure_is_rolled_back(self):
+        from app.models import JobDescription
+        with mock.patch('app.routes.encode_texts', side_effect=RuntimeError('encoder down')):
+            response = self.client.post('/shortlist/batch', json={'job_descriptions': ['kw-python role']})
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('encoder down', response.get_json()['error'])
+        with self.app.app_context():
+            self.assertEqual(JobDescription.query.filter(JobDescription.description.like('kw-%')).count(), 0)
+
+    def test_stream_reports_progress_then_saves(self):
+        with mock.patch.object(Config, 'SHORTLIST_STREAM_CHUNK_SIZE', 1):
+            response = self.client.post('/shortlist/stream', data={'job_description': 'kw-data role'})
+            events = [(frame.split('\n')[0][len('event: '):], json.loads(frame.split('\n')[1][len('data: '):]))
+                      for frame in response.get_data(as_text=True).strip().split('\n\n')]
+
+        names = [name for name, _ in events]
+        self.assertEqual(names, ['start'] + ['progress'] * self.pool_size + ['complete'])
+        self.assertEqual(events[0][1]['total_candidates'], self.pool_size)
+        self.assertEqual([data['processed'] for name, data in events if name == 'progress'],
+                         list(range(1, self.pool_size + 1)))
+
+        top = events[-1][1]['top_candidates'][0]
+        self.assertEqual((top['candidate_id'], top['full_name']), (self.ids['kw-data'], 'Route kw-data'))
+        self.assertEqual(self._status('kw-data'), 'shortlisted')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,80 @@
+import unittest
+from unittest import mock
+from app.utils import skills
+from app.utils.skills import normalize_skill_name, DEFAULT_SKILLS
+from app.utils.shortlister import build_candidate_text, get_candidate_text
+from database import DatabaseTestCase
+
+class TestSkillNormalization(unittest.TestCase):
+    def test_normalize_skill_name(self):
+        """Case, whitespace and trailing punctuation do not create new skills"""
+        self.assertEqual(normalize_skill_name('  Machine   Learning, '), 'machine learning')
+        self.assertEqual(normalize_skill_name('PYTHON'), normalize_skill_name('python'))
+        self.assertEqual(normalize_skill_name('• AWS |'), 'aws')
+        self.assertEqual(normalize_skill_name(None), '')
+
+    def test_default_aliases_are_unique(self):
+        """Every seeded canonical name and alias maps to exactly one skill"""
+        keys = []
+        for canonical_name, _, aliases in DEFAULT_SKILLS:
+            keys.append(normalize_skill_name(canonical_name))
+            keys.extend(normalize_skill_name(alias) for alias in aliases)
+        self.assertEqual(len(keys), len(set(keys)))
+
+    def test_materialized_profile_is_preferred(self):
+        """Ranking reads the stored profile text instead of rebuilding it"""
+        candidate = {
+            'full_name': 'Ana Lopez',
+            'years_experience': 5,
+            'education': [{'degree': 'BSc Computer Science'}],
+            'skills': [{'name': 'Python'}]
+        }
+        self.assertEqual(get_candidate_text(candidate), build_candidate_text(candidate))
+        
+        candidate['profile_text'] = 'stored profile'
+        self.assertEqual(get_candidate_text(candidate), 'stored profile')
+
+class TestResolveSkill(DatabaseTestCase):
+    def setUp(self):
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        patch = mock.patch.object(skills, '_skill_cache', {})
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        from app.models import db, SkillDictionary
+        db.session.rollback()
+        SkillDictionary.query.filter(SkillDictionary.normalized_name.like('resolve-test%')).delete(
+            synchronize_session=False)
+        db.session.commit()
+        self.ctx.pop()
+
+    def test_new_skill_is_rolled_back_with_the_caller(self):
+        from app.models import db, SkillDictionary
+        skill_id, name = skills.resolve_skill('Resolve-Test Rollback')
+        self.assertEqual(skills.resolve_skill('resolve-test  rollback'), (skill_id, name))
+        self.assertNotIn('resolve-test rollback', skills._skill_cache)
+        db.session.rollback()
+
+        self.assertIsNone(SkillDictionary.query.filter_by(normalized_name='resolve-test rollback').first())
+        self.assertNotIn('resolve-test rollback', skills._skill_cache)
+
+    def test_new_skill_is_cached_on_commit(self):
+        from app.models import db
+        resolved = skills.resolve_skill('Resolve-Test Commit')
+        db.session.commit()
+        self.assertEqual(skills._skill_cache['resolve-test commit'], resolved)
+
+    def test_alias_resolves_from_the_database(self):
+        """An alias missing from the cache is found through the aliases column"""
+        from app.models import db, SkillDictionary
+        entry = SkillDictionary(canonical_name='Resolve-Test Alias', normalized_name='resolve-test alias',
+                                aliases=['resolve-test other name'])
+        db.session.add(entry)
+        db.session.commit()
+
+        self.assertEqual(skills.resolve_skill('Resolve-Test Other Name'), (entry.id, 'Resolve-Test Alias'))
+
+if __name__ == '__main__':
+    unittest.main()
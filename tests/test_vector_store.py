@@ -0,0 +1,97 @@
+import unittest
+from unittest import mock
+import numpy as np
+from app.config import Config
+from app.utils.vector_store import to_vector_literal
+from database import DatabaseTestCase
+
+class TestVectorLiteral(unittest.TestCase):
+    def test_to_vector_literal(self):
+        """Embeddings are serialized in pgvector's text format"""
+        self.assertEqual(to_vector_literal(np.array([1.0, -0.5, 0.25])), '[1,-0.5,0.25]')
+
+class TestPgvectorSearch(DatabaseTestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Create the schema on the test database and load a few candidates"""
+        from app.models import db, Candidate
+        from app.utils.vector_store import init_vector_store, store_candidate_embedding
+        
+        super().setUpClass()
+        cls.ctx = cls.app.app_context()
+        cls.ctx.push()
+        with mock.patch.object(Config, 'EMBEDDING_DIMENSION', 4):
+            init_vector_store()
+        
+        cls.embeddings = {
+            'near@example.com': (np.array([1.0, 0.1, 0.0, 0.0]), 6),
+            'mid@example.com': (np.array([0.6, 0.6, 0.2, 0.0]), 2),
+            'far@example.com': (np.array([0.0, 0.0, 1.0, 1.0]), 10),
+        }
+        cls.ids = {}
+        for email, (embedding, years) in cls.embeddings.items():
+            candidate = Candidate(full_name=email.split('@')[0], email=email, years_experience=years)
+            db.session.add(candidate)
+            db.session.flush()
+            store_candidate_embedding(candidate.candidate_id, embedding)
+            cls.ids[email] = candidate.candidate_id
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        from app.models import db, Candidate
+        Candidate.query.filter(Candidate.candidate_id.in_(cls.ids.values())).delete(synchronize_session=False)
+        db.session.commit()
+        cls.ctx.pop()
+
+    def test_search_matches_numpy_ranking(self):
+        """Postgres top-k agrees with in-process cosine similarity"""
+        from app.utils.vector_store import search_candidates
+        from app.utils.shortlister import _normalize_rows
+        query = np.array([1.0, 0.0, 0.0, 0.0])
+        
+        results = search_candidates(query, limit=3)
+        self.assertEqual([r['candidate_id'] for r in results],
+                         [self.ids['near@example.com'], self.ids['mid@example.com'], self.ids['far@example.com']])
+        
+        expected = _normalize_rows(np.stack([e for e, _ in self.embeddings.values()])) @ (query / np.linalg.norm(query))
+        for result, score in zip(results, expected):
+            self.assertAlmostEqual(result['similarity_score'], float(score), places=5)
+
+    def test_search_applies_structured_filters(self):
+        """Structured filters are applied in the same query as the vector search"""
+        from app.utils.vector_store import search_candidates, count_indexed_candidates
+        query = np.array([1.0, 0.0, 0.0, 0.0])
+        
+        results = search_candidates(query, limit=3, min_experience=5)
+        self.assertEqual([r['candidate_id'] for r in results],
+                         [self.ids['near@example.com'], self.ids['far@example.com']])
+        self.assertEqual(count_indexed_candidates(min_experience=5), 2)
+
+    def test_limit_above_ef_search_cap_scans_exactly(self):
+        """Limits pgvector's ef_search cap can't serve are not silently truncated"""
+        from app.utils import vector_store
+        query = np.array([1.0, 0.0, 0.0, 0.0])
+        
+        with mock.patch.object(vector_store, 'HNSW_EF_SEARCH_MAX', 2):
+            results = vector_store.search_candidates(query, limit=3)
+        self.assertEqual([r['candidate_id'] for r in results],
+                         [self.ids['near@example.com'], self.ids['mid@example.com'], self.ids['far@example.com']])
+
+    def test_short_index_search_falls_back_to_exact(self):
+        from app.utils import vector_store
+        real_search = vector_store._search_rows
+        calls = []
+        
+        def short_index_search(where, params, exact):
+            calls.append(exact)
+            rows = real_search(where, params, exact)
+            return rows if exact else rows[:1]
+        
+        with mock.patch.object(vector_store, '_search_rows', side_effect=short_index_search):
+            results = vector_store.search_candidates(np.array([1.0, 0.0, 0.0, 0.0]), limit=2, min_experience=5)
+        self.assertEqual(calls, [False, True])
+        self.assertEqual(len(results), 2)
+
+if __name__ == '__main__':
+    unittest.main()